@@ -1,6 +1,40 @@
 import streamlit as st
-import pandas as pd
 import time
+import os
+import tempfile
+import logging
+import re
+import threading
+from contextlib import contextmanager
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import unitconvert
+from unitconvert.coldstart import warmup
+from unitconvert.expression import compile_expression
+from unitconvert.history import HistoryStore
+from unitconvert.metrics import LatencyRecorder, SessionTracker, deep_sizeof, process_rss
+from unitconvert.reference import reference_markdown
+from unitconvert.search import default_index
+
+run_started = time.perf_counter()
+logger = logging.getLogger(__name__)
+
+# Latency settings in milliseconds, overridable through the environment
+SPINNER_THRESHOLD_MS = float(os.environ.get("UNICONVERT_SPINNER_THRESHOLD_MS", 150))
+LATENCY_BUDGET_MS = float(os.environ.get("UNICONVERT_LATENCY_BUDGET_MS", 100))
+
+# Conversion history size per session and optional SQLite file to persist it in
+HISTORY_CAPACITY = int(os.environ.get("UNICONVERT_HISTORY_CAPACITY", 1000))
+HISTORY_DB = os.environ.get("UNICONVERT_HISTORY_DB")
+
+# Admin panel access (?admin=<token>) and how long idle sessions keep their data
+ADMIN_TOKEN = os.environ.get("UNICONVERT_ADMIN_TOKEN")
+IDLE_EVICT_SECONDS = float(os.environ.get("UNICONVERT_IDLE_EVICT_SECONDS", 1800))
+
+# How often the live feed panel redraws, and the source it offers by default
+LIVE_REFRESH_SECONDS = float(os.environ.get("UNICONVERT_LIVE_REFRESH_SECONDS", 0.5))
+LIVE_DEFAULT_SOURCE = os.environ.get("UNICONVERT_LIVE_SOURCE", "simulated")
 
 # Page configuration
 st.set_page_config(
@@ -11,8 +45,7 @@ st.set_page_config(
 )
 
 # Simplified CSS without recursive definitions
-def local_css():
-    st.markdown("""
+APP_CSS = """
     <style>
     /* Base styles */
     .stApp {
@@ -162,10 +195,116 @@ def local_css():
         }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+# Minify the stylesheet once per process instead of on every rerun
+@st.cache_resource
+def compiled_css():
+    css = re.sub(r"/\*.*?\*/", "", APP_CSS, flags=re.S)
+    return re.sub(r"\s+", " ", css).strip()
+
+def local_css():
+    st.markdown(compiled_css(), unsafe_allow_html=True)
 
 local_css()
 
+# Static per-category tables, built once per process and shared by all sessions
+@st.cache_resource
+def category_units(category):
+    return list(unitconvert.get_category(category).units)
+
+@st.cache_resource
+def reference_text(category):
+    return reference_markdown(category)
+
+# Build lazily constructed tables once per process on a background thread, so
+# neither the first page render nor the first search waits for them
+@st.cache_resource
+def warm_up():
+    thread = threading.Thread(target=warmup, name="unitconvert-warmup", daemon=True)
+    thread.start()
+    return thread
+
+# Process-wide record of script run durations, shared by all sessions
+@st.cache_resource
+def rerun_latency():
+    return LatencyRecorder()
+
+# Same for runs of the converter panel, whether part of a full run or alone
+@st.cache_resource
+def panel_latency():
+    return LatencyRecorder()
+
+# Process-wide per-session rerun and memory statistics
+@st.cache_resource
+def session_tracker():
+    return SessionTracker()
+
+# Email of the signed-in viewer, or None. Outside Streamlit Community Cloud
+# every session reports the same placeholder address, so it identifies no one
+def authenticated_user():
+    email = getattr(st.experimental_user, "email", None)
+    return None if email in (None, "", "test@example.com") else email
+
+# Keep this session from being evicted as idle. Fragment reruns (the converter
+# panel, the live panel's timer) never reach the full-run bookkeeping below
+def touch_session():
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        session_tracker().touch(ctx.session_id, ctx.session_state)
+
+# This session's conversion history, created on first use and again after
+# eviction. It is only persisted for a signed-in viewer; anonymous sessions
+# would otherwise share one bucket
+def session_history():
+    if 'history' not in st.session_state:
+        user = authenticated_user()
+        st.session_state.history = HistoryStore(
+            capacity=HISTORY_CAPACITY,
+            path=HISTORY_DB if user else None,
+            user=user or "anonymous",
+        )
+    return st.session_state.history
+
+# Drop an idle session's history; it is reloaded from SQLite if the user returns
+def evict_session_data(state):
+    if "history" in state:
+        state["history"].close()
+        del state["history"]
+    if "live_feed" in state and state["live_feed"] is not None:
+        state["live_feed"].stop()
+        state["live_feed"] = None
+
+def is_admin():
+    return ADMIN_TOKEN is not None and st.query_params.get("admin") == ADMIN_TOKEN
+
+def render_admin_panel():
+    tracker = session_tracker()
+    with st.expander("🛠️ Sessions and memory", expanded=True):
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Sessions", len(tracker))
+        col2.metric("Session state", f"{tracker.total_state_bytes() / 2**20:.2f} MiB")
+        col3.metric("Process RSS", f"{process_rss() / 2**20:.0f} MiB")
+        col4.metric("p99 full run", f"{rerun_latency().percentile(99) * 1000:.1f} ms")
+        col5.metric("p99 panel run", f"{panel_latency().percentile(99) * 1000:.1f} ms")
+        st.dataframe(tracker.snapshot(), use_container_width=True, hide_index=True)
+        if st.button("Evict idle sessions now"):
+            evicted = tracker.evict_idle(IDLE_EVICT_SECONDS, evict_session_data)
+            st.success(f"Evicted {evicted} idle session(s)")
+
+# Show a spinner only when the wrapped work takes longer than threshold_ms
+@contextmanager
+def delayed_spinner(text, threshold_ms=SPINNER_THRESHOLD_MS):
+    placeholder = st.empty()
+    timer = threading.Timer(threshold_ms / 1000, placeholder.info, args=(f"⏳ {text}",))
+    add_script_run_ctx(timer)
+    timer.start()
+    try:
+        yield
+    finally:
+        timer.cancel()
+        placeholder.empty()
+
 # Detect mobile devices (simplified version)
 def is_mobile():
     try:
@@ -173,202 +312,158 @@ def is_mobile():
     except:
         return False
 
-# Define conversion functions and formulas
-def convert_length(value, from_unit, to_unit):
-    conversions = {
-        'meter': 1,
-        'kilometer': 0.001,
-        'centimeter': 100,
-        'millimeter': 1000,
-        'inch': 39.3701,
-        'foot': 3.28084,
-        'yard': 1.09361,
-        'mile': 0.000621371,
-        'nautical mile': 0.000539957
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[to_unit] / conversions[from_unit], formula
-
-def convert_weight(value, from_unit, to_unit):
-    conversions = {
-        'kilogram': 1,
-        'gram': 1000,
-        'milligram': 1e6,
-        'pound': 2.20462,
-        'ounce': 35.274,
-        'ton': 0.001,
-        'stone': 0.157473
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[to_unit] / conversions[from_unit], formula
-
-def convert_temperature(value, from_unit, to_unit):
-    if from_unit == 'celsius' and to_unit == 'fahrenheit':
-        formula = f"({value} × 9/5) + 32"
-        return (value * 9/5) + 32, formula
-    elif from_unit == 'fahrenheit' and to_unit == 'celsius':
-        formula = f"({value} - 32) × 5/9"
-        return (value - 32) * 5/9, formula
-    elif from_unit == 'celsius' and to_unit == 'kelvin':
-        formula = f"{value} + 273.15"
-        return value + 273.15, formula
-    elif from_unit == 'kelvin' and to_unit == 'celsius':
-        formula = f"{value} - 273.15"
-        return value - 273.15, formula
-    elif from_unit == 'fahrenheit' and to_unit == 'kelvin':
-        formula = f"({value} - 32) × 5/9 + 273.15"
-        return (value - 32) * 5/9 + 273.15, formula
-    elif from_unit == 'kelvin' and to_unit == 'fahrenheit':
-        formula = f"({value} - 273.15) × 9/5 + 32"
-        return (value - 273.15) * 9/5 + 32, formula
-    else:
-        return value, "No conversion needed"
-
-def convert_volume(value, from_unit, to_unit):
-    conversions = {
-        'liter': 1,
-        'milliliter': 1000,
-        'cubic meter': 0.001,
-        'gallon (US)': 0.264172,
-        'quart (US)': 1.05669,
-        'pint (US)': 2.11338,
-        'cup (US)': 4.22675,
-        'fluid ounce (US)': 33.814,
-        'tablespoon (US)': 67.628,
-        'teaspoon (US)': 202.884
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[to_unit] / conversions[from_unit], formula
-
-def convert_time(value, from_unit, to_unit):
-    conversions = {
-        'second': 1,
-        'millisecond': 1000,
-        'minute': 1/60,
-        'hour': 1/3600,
-        'day': 1/86400,
-        'week': 1/604800,
-        'month (30 days)': 1/2592000,
-        'year (365 days)': 1/31536000,
-        'decade': 1/315360000,
-        'century': 1/3153600000,
-        'millennium': 1/31536000000
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[to_unit] / conversions[from_unit], formula
-
-def convert_data(value, from_unit, to_unit):
-    conversions = {
-        'byte': 1,
-        'kilobyte': 1/1024,
-        'megabyte': 1/(1024**2),
-        'gigabyte': 1/(1024**3),
-        'terabyte': 1/(1024**4),
-        'petabyte': 1/(1024**5),
-        'bit': 8,
-        'kibibyte': 1/1024,
-        'mebibyte': 1/(1024**2),
-        'gibibyte': 1/(1024**3),
-        'tebibyte': 1/(1024**4),
-        'pebibyte': 1/(1024**5)
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[from_unit] / conversions[to_unit], formula
-
-def convert_area(value, from_unit, to_unit):
-    conversions = {
-        'square meter': 1,
-        'square kilometer': 0.000001,
-        'square centimeter': 10000,
-        'square millimeter': 1000000,
-        'square inch': 1550.0031,
-        'square foot': 10.76391,
-        'square yard': 1.19599,
-        'acre': 0.000247105,
-        'hectare': 0.0001
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[to_unit] / conversions[from_unit], formula
-
-def convert_speed(value, from_unit, to_unit):
-    conversions = {
-        'meter per second': 1,
-        'kilometer per hour': 3.6,
-        'mile per hour': 2.23694,
-        'knot': 1.94384,
-        'foot per second': 3.28084,
-        'inch per second': 39.3701
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[to_unit] / conversions[from_unit], formula
-
-def convert_energy(value, from_unit, to_unit):
-    conversions = {
-        'joule': 1,
-        'kilojoule': 0.001,
-        'calorie': 0.239006,
-        'kilocalorie': 0.000239006,
-        'watt hour': 0.000277778,
-        'kilowatt hour': 0.000000277778,
-        'electron volt': 6.242e+18,
-        'british thermal unit': 0.000947817
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[from_unit] / conversions[to_unit], formula
-
-def convert_pressure(value, from_unit, to_unit):
-    conversions = {
-        'pascal': 1,
-        'kilopascal': 0.001,
-        'megapascal': 0.000001,
-        'bar': 0.00001,
-        'atmosphere': 0.00000986923,
-        'torr': 0.00750062,
-        'psi': 0.000145038,
-        'millimeter of mercury': 0.00750062
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[from_unit] / conversions[to_unit], formula
-
-def convert_power(value, from_unit, to_unit):
-    conversions = {
-        'watt': 1,
-        'kilowatt': 0.001,
-        'megawatt': 0.000001,
-        'horsepower': 0.00134102,
-        'british thermal unit per hour': 3.41214,
-        'calorie per second': 0.239006
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[from_unit] / conversions[to_unit], formula
-
-def convert_frequency(value, from_unit, to_unit):
-    conversions = {
-        'hertz': 1,
-        'kilohertz': 0.001,
-        'megahertz': 0.000001,
-        'gigahertz': 0.000000001,
-        'cycle per second': 1,
-        'revolution per minute': 60,
-        'beat per minute': 60
-    }
-    formula = f"{value} {from_unit} × ({conversions[to_unit]}/{conversions[from_unit]})"
-    return value * conversions[from_unit] / conversions[to_unit], formula
+# Widget callbacks run before the script, so one click is one script run
+def select_category(name):
+    st.session_state.selected_unit = name
 
 def swap_units():
     temp = st.session_state.from_unit
     st.session_state.from_unit = st.session_state.to_unit
     st.session_state.to_unit = temp
 
+def apply_search():
+    query = st.session_state.unit_search
+    st.session_state.search_error = None
+    st.session_state.search_result = None
+    if not query.strip():
+        return
+    try:
+        # Exact expressions first, e.g. "3 ft 4 in to cm"; compound
+        # quantities are summed and shown in their last unit
+        plan = compile_expression(query)
+        if plan.category is None:
+            st.session_state.search_result = f"{query} = {plan.result:.6g} {plan.to_unit}"
+            return
+        from_unit = plan.quantities[-1][1]
+        if len(plan.quantities) == 1:
+            value = plan.quantities[0][0]
+        else:
+            value = unitconvert.convert(plan.category, plan.result, plan.to_unit, from_unit)
+        category, to_unit = plan.category, plan.to_unit
+    except ValueError:
+        match = default_index().resolve(query)
+        if match is None:
+            st.session_state.search_error = f"No unit matches “{query}”"
+            return
+        category, from_unit, to_unit, value = match.category, match.from_unit, match.to_unit, match.value
+    st.session_state.selected_unit = unitconvert.get_category(category).name
+    st.session_state.from_unit = from_unit
+    if to_unit is not None:
+        st.session_state.to_unit = to_unit
+    if value is not None:
+        st.session_state.value_input = value
+
+# Live feed: readings are converted in micro-batches on a background thread
+# and only the live panel fragment redraws, on a timer
+def start_live_feed(category):
+    from unitconvert.stream import LiveConversion, LiveFeed
+
+    stop_live_feed()
+    try:
+        conversion = LiveConversion(category, st.session_state.from_unit, st.session_state.to_unit)
+    except ValueError as exc:
+        st.session_state.live_error = str(exc)
+        return
+    st.session_state.live_error = None
+    st.session_state.live_feed = LiveFeed(conversion, st.session_state.live_source).start()
+
+def stop_live_feed():
+    feed = st.session_state.get('live_feed')
+    if feed is not None:
+        feed.stop()
+        st.session_state.live_feed = None
+
+def render_live_panel():
+    touch_session()
+    feed = st.session_state.get('live_feed')
+    if feed is None:
+        return
+    if feed.error is not None:
+        st.error(f"Feed stopped: {feed.error}")
+    conversion = feed.conversion
+    latest = conversion.latest()
+    if latest is None:
+        st.caption("Waiting for readings…")
+        return
+    _, reading, converted = latest
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"Reading ({conversion.from_unit})", f"{reading:.4f}")
+    col2.metric(f"Converted ({conversion.to_unit})", f"{converted:.4f}")
+    col3.metric("Readings", f"{conversion.received:,}")
+    _, _, values = conversion.snapshot()
+    st.line_chart({conversion.to_unit: values}, height=220)
+
+def render_live_feed(category):
+    st.text_input("Source", value=LIVE_DEFAULT_SOURCE, key="live_source",
+                  help="simulated[:rate], tcp://host:port, unix:///path or pipe:/path, one reading per line")
+    col1, col2 = st.columns(2)
+    col1.button("▶️ Start", key="live_start", on_click=start_live_feed, args=(category,),
+                use_container_width=True)
+    col2.button("⏹️ Stop", key="live_stop", on_click=stop_live_feed, use_container_width=True)
+    if st.session_state.get('live_error'):
+        st.warning(st.session_state.live_error)
+    feed = st.session_state.get('live_feed')
+    refresh = LIVE_REFRESH_SECONDS if feed is not None and feed.running else None
+    st.fragment(render_live_panel, run_every=refresh)()
+
+# Bulk conversion of uploaded CSV/Parquet files, processed chunk by chunk
+def render_bulk_conversion(category, units):
+    uploaded = st.file_uploader("Upload a CSV or Parquet file", type=["csv", "parquet"])
+    if uploaded is None:
+        return
+
+    # pandas and pyarrow are only imported once a file is actually uploaded
+    from unitconvert.files import convert_file, detect_format, read_columns
+
+    fmt = detect_format(uploaded.name)
+    columns = st.multiselect("Columns to convert", read_columns(uploaded, fmt))
+    uploaded.seek(0)
+    column_units = {
+        column: st.selectbox(f"Unit of '{column}'", units, key=f"bulk_unit_{column}")
+        for column in columns
+    }
+    to_unit = st.selectbox("Convert to", units, key="bulk_to_unit")
+
+    if not columns or not st.button("Convert file", key="bulk_convert"):
+        return
+
+    status = st.empty()
+
+    def report(rows, elapsed):
+        status.info(f"{rows:,} rows converted · {rows / max(elapsed, 1e-9):,.0f} rows/s")
+
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    try:
+        try:
+            with os.fdopen(fd, "wb") as destination:
+                convert_file(uploaded, destination, category, column_units, to_unit, fmt=fmt, progress=report)
+        except ValueError as exc:  # e.g. a selected column holds text
+            status.error(f"Could not convert the file: {exc}")
+            return
+        with open(path, "rb") as converted:
+            st.download_button(
+                "Download converted file",
+                data=converted,
+                file_name=f"converted_{uploaded.name}",
+                use_container_width=True,
+            )
+    finally:
+        os.remove(path)
+
 # Initialize session state variables
-if 'history' not in st.session_state:
-    st.session_state.history = []
 if 'from_unit' not in st.session_state:
     st.session_state.from_unit = None
 if 'to_unit' not in st.session_state:
     st.session_state.to_unit = None
 if 'selected_unit' not in st.session_state:
     st.session_state.selected_unit = "Length"
+if 'value_input' not in st.session_state:
+    st.session_state.value_input = 1.0
+
+warm_up()
+
+# Count script executions for this session (checked by tests/test_app.py)
+st.session_state.script_runs = st.session_state.get('script_runs', 0) + 1
 
 # Sidebar
 with st.sidebar:
@@ -385,78 +480,25 @@ with st.sidebar:
         ">Select Unit Type</h3>
     """, unsafe_allow_html=True)
     
-    # Create tabs for category groups
-    tabs = st.tabs(["Basic", "Science", "Digital"])
-    
-    with tabs[0]:  # Basic measurements
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("📏 Length", use_container_width=True):
-                st.session_state.selected_unit = "Length"
-                st.rerun()
-            if st.button("⚖️ Weight", use_container_width=True):
-                st.session_state.selected_unit = "Weight"
-                st.rerun()
-            if st.button("🌡️ Temperature", use_container_width=True):
-                st.session_state.selected_unit = "Temperature"
-                st.rerun()
-        with col2:
-            if st.button("🧪 Volume", use_container_width=True):
-                st.session_state.selected_unit = "Volume"
-                st.rerun()
-            if st.button("📐 Area", use_container_width=True):
-                st.session_state.selected_unit = "Area"
-                st.rerun()
-            if st.button("⚡ Speed", use_container_width=True):
-                st.session_state.selected_unit = "Speed"
-                st.rerun()
-    
-    with tabs[1]:  # Science and time
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("⏱️ Time", use_container_width=True):
-                st.session_state.selected_unit = "Time"
-                st.rerun()
-            if st.button("📊 Pressure", use_container_width=True):
-                st.session_state.selected_unit = "Pressure"
-                st.rerun()
-        with col2:
-            if st.button("⚗️ Energy", use_container_width=True):
-                st.session_state.selected_unit = "Energy"
-                st.rerun()
-            if st.button("🔋 Power", use_container_width=True):
-                st.session_state.selected_unit = "Power"
-                st.rerun()
+    # Create tabs for category groups, one button per registered category
+    groups = list(unitconvert.GROUPS.items())
+    tabs = st.tabs([group for group, _ in groups])
     
-    with tabs[2]:  # Digital units
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("💾 Data", use_container_width=True):
-                st.session_state.selected_unit = "Data"
-                st.rerun()
-            if st.button("📶 Frequency", use_container_width=True):
-                st.session_state.selected_unit = "Frequency"
-                st.rerun()
+    for tab, (group, categories) in zip(tabs, groups):
+        with tab:
+            columns = st.columns(2)
+            half = (len(categories) + 1) // 2
+            for i, category in enumerate(categories):
+                with columns[i // half]:
+                    st.button(f"{category.icon} {category.name}", use_container_width=True,
+                              key=f"category_{category.id}", on_click=select_category, args=(category.name,))
     
     # Display unit type icon
-    unit_icons = {
-        "Length": "📏",
-        "Weight": "⚖️",
-        "Temperature": "🌡️",
-        "Volume": "🧪",
-        "Time": "⏱️",
-        "Data": "💾",
-        "Area": "📐",
-        "Speed": "⚡",
-        "Pressure": "📊",
-        "Energy": "⚗️",
-        "Power": "🔋",
-        "Frequency": "📶"
-    }
+    selected_category = unitconvert.get_category(st.session_state.selected_unit)
     
     st.markdown(f"""
     <div class="unit-icon">
-        <div style="font-size: 48px;">{unit_icons.get(st.session_state.selected_unit, "🔄")}</div>
+        <div style="font-size: 48px;">{selected_category.icon}</div>
         <h3>{st.session_state.selected_unit}</h3>
     </div>
     """, unsafe_allow_html=True)
@@ -472,9 +514,9 @@ with st.sidebar:
     """, unsafe_allow_html=True)
     
     # Display history with better styling
-    if st.session_state.history:
-        for i, conversion in enumerate(reversed(st.session_state.history)):
-            st.markdown(f'<div class="history-item">{conversion}</div>', unsafe_allow_html=True)
+    if session_history():
+        for record in session_history().records(limit=5):
+            st.markdown(f'<div class="history-item">{record.value:.4f} {record.from_unit} → {record.result:.4f} {record.to_unit}</div>', unsafe_allow_html=True)
     else:
         st.info("No recent conversions")
 
@@ -482,204 +524,114 @@ with st.sidebar:
 st.markdown('<h1 class="animate-fade-in">Unit Converter</h1>', unsafe_allow_html=True)
 st.markdown('<p class="animate-fade-in">Convert between different units with precision and ease</p>', unsafe_allow_html=True)
 
+# Jump straight to a conversion, e.g. "5 ft to m" or "kwh"
+st.text_input("Search units", key="unit_search", on_change=apply_search,
+              placeholder="e.g. 5 ft to m, 3 ft 4 in to cm, kwh")
+if st.session_state.get('search_error'):
+    st.warning(st.session_state.search_error)
+if st.session_state.get('search_result'):
+    st.info(st.session_state.search_result)
+
 # Unit selection based on type
 selected_unit = st.session_state.selected_unit
 
-if selected_unit == "Length":
-    units = ['meter', 'kilometer', 'centimeter', 'millimeter', 'inch', 'foot', 'yard', 'mile', 'nautical mile']
-elif selected_unit == "Weight":
-    units = ['kilogram', 'gram', 'milligram', 'pound', 'ounce', 'ton', 'stone']
-elif selected_unit == "Temperature":
-    units = ['celsius', 'fahrenheit', 'kelvin']
-elif selected_unit == "Volume":
-    units = ['liter', 'milliliter', 'cubic meter', 'gallon (US)', 'quart (US)', 'pint (US)', 'cup (US)', 
-             'fluid ounce (US)', 'tablespoon (US)', 'teaspoon (US)']
-elif selected_unit == "Time":
-    units = ['second', 'millisecond', 'minute', 'hour', 'day', 'week', 'month (30 days)', 'year (365 days)',
-             'decade', 'century', 'millennium']
-elif selected_unit == "Data":
-    units = ['byte', 'kilobyte', 'megabyte', 'gigabyte', 'terabyte', 'petabyte',
-             'bit', 'kibibyte', 'mebibyte', 'gibibyte', 'tebibyte', 'pebibyte']
-elif selected_unit == "Area":
-    units = ['square meter', 'square kilometer', 'square centimeter', 'square millimeter',
-             'square inch', 'square foot', 'square yard', 'acre', 'hectare']
-elif selected_unit == "Speed":
-    units = ['meter per second', 'kilometer per hour', 'mile per hour', 'knot',
-             'foot per second', 'inch per second']
-elif selected_unit == "Energy":
-    units = ['joule', 'kilojoule', 'calorie', 'kilocalorie', 'watt hour', 
-             'kilowatt hour', 'electron volt', 'british thermal unit']
-elif selected_unit == "Pressure":
-    units = ['pascal', 'kilopascal', 'megapascal', 'bar', 'atmosphere', 
-             'torr', 'psi', 'millimeter of mercury']
-elif selected_unit == "Power":
-    units = ['watt', 'kilowatt', 'megawatt', 'horsepower', 
-             'british thermal unit per hour', 'calorie per second']
-elif selected_unit == "Frequency":
-    units = ['hertz', 'kilohertz', 'megahertz', 'gigahertz',
-             'cycle per second', 'revolution per minute', 'beat per minute']
-
-# Card for input
-st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
-
-# Optimize layout for mobile
-if is_mobile():
-    column_ratio = [1, 0.5, 1]  # Adjusted ratios for mobile
-else:
-    column_ratio = [2, 1, 2]  # Original ratios for desktop
-
-# Update the main content layout
-col1, col2, col3 = st.columns(column_ratio)
-
-with col1:
-    from_unit = st.selectbox("From", units, key="from_unit_select", index=units.index(st.session_state.from_unit) if st.session_state.from_unit in units else 0)
-    st.session_state.from_unit = from_unit
-    value = st.number_input("Value", value=1.0, step=0.01, format="%.4f")
-
-with col2:
-    st.markdown('''
-        <div style="display: flex; 
-                    justify-content: center; 
-                    align-items: center; 
-                    height: 100%; 
-                    padding: 1rem 0;">
-    ''', unsafe_allow_html=True)
-    if st.button("↔️ Swap", key="swap_button"):
-        swap_units()
-        st.rerun()
-    st.markdown('</div>', unsafe_allow_html=True)
+units = category_units(selected_unit)
 
-with col3:
-    to_unit = st.selectbox("To", units, key="to_unit_select", index=units.index(st.session_state.to_unit) if st.session_state.to_unit in units else min(1, len(units)-1))
-    st.session_state.to_unit = to_unit
-    st.markdown("<br>", unsafe_allow_html=True)
-    convert_button = st.button("Convert", use_container_width=True)
+# Converter card, isolated in a fragment so that value and unit changes rerun
+# only this panel instead of the whole page
+@st.fragment
+def converter_panel(selected_unit, units):
+    panel_started = time.perf_counter()
+    st.session_state.panel_runs = st.session_state.get('panel_runs', 0) + 1
+    touch_session()
 
-st.markdown('</div>', unsafe_allow_html=True)
+    # Card for input
+    st.markdown('<div class="card animate-fade-in">', unsafe_allow_html=True)
 
-# Perform conversion
-if value is not None and (convert_button or True):  # Auto-convert
-    # Show a spinner during conversion
-    with st.spinner("Converting..."):
-        time.sleep(0.3)  # Small delay for effect
-        
-        if selected_unit == "Length":
-            result, formula = convert_length(value, from_unit, to_unit)
-        elif selected_unit == "Weight":
-            result, formula = convert_weight(value, from_unit, to_unit)
-        elif selected_unit == "Temperature":
-            result, formula = convert_temperature(value, from_unit, to_unit)
-        elif selected_unit == "Volume":
-            result, formula = convert_volume(value, from_unit, to_unit)
-        elif selected_unit == "Time":
-            result, formula = convert_time(value, from_unit, to_unit)
-        elif selected_unit == "Data":
-            result, formula = convert_data(value, from_unit, to_unit)
-        elif selected_unit == "Area":
-            result, formula = convert_area(value, from_unit, to_unit)
-        elif selected_unit == "Speed":
-            result, formula = convert_speed(value, from_unit, to_unit)
-        elif selected_unit == "Energy":
-            result, formula = convert_energy(value, from_unit, to_unit)
-        elif selected_unit == "Pressure":
-            result, formula = convert_pressure(value, from_unit, to_unit)
-        elif selected_unit == "Power":
-            result, formula = convert_power(value, from_unit, to_unit)
-        elif selected_unit == "Frequency":
-            result, formula = convert_frequency(value, from_unit, to_unit)
+    # Optimize layout for mobile
+    if is_mobile():
+        column_ratio = [1, 0.5, 1]  # Adjusted ratios for mobile
+    else:
+        column_ratio = [2, 1, 2]  # Original ratios for desktop
+
+    # Update the main content layout
+    col1, col2, col3 = st.columns(column_ratio)
+
+    with col1:
+        from_unit = st.selectbox("From", units, key="from_unit_select", index=units.index(st.session_state.from_unit) if st.session_state.from_unit in units else 0)
+        st.session_state.from_unit = from_unit
+        value = st.number_input("Value", key="value_input", step=0.01, format="%.4f")
+
+    with col2:
+        st.markdown('''
+            <div style="display: flex; 
+                        justify-content: center; 
+                        align-items: center; 
+                        height: 100%; 
+                        padding: 1rem 0;">
+        ''', unsafe_allow_html=True)
+        st.button("↔️ Swap", key="swap_button", on_click=swap_units)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col3:
+        to_unit = st.selectbox("To", units, key="to_unit_select", index=units.index(st.session_state.to_unit) if st.session_state.to_unit in units else min(1, len(units)-1))
+        st.session_state.to_unit = to_unit
+        st.markdown("<br>", unsafe_allow_html=True)
+        convert_button = st.button("Convert", use_container_width=True)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Perform conversion
+    if value is not None and (convert_button or True):  # Auto-convert
+        # Only show a spinner if the conversion is actually slow
+        with delayed_spinner("Converting..."):
+            conversion = unitconvert.conversion(selected_unit, value, from_unit, to_unit)
+            result = conversion.result
     
-    # Display result
-    st.markdown(f"""
-    <div class="result-display animate-fade-in">
-        {value:.4f} {from_unit} = {result:.4f} {to_unit}
-        <button class="copy-btn" onclick="navigator.clipboard.writeText('{result:.4f} {to_unit}')">📋</button>
-    </div>
-    """, unsafe_allow_html=True)
+        # Display result
+        st.markdown(f"""
+        <div class="result-display animate-fade-in">
+            {value:.4f} {from_unit} = {result:.4f} {to_unit}
+            <button class="copy-btn" onclick="navigator.clipboard.writeText('{result:.4f} {to_unit}')">📋</button>
+        </div>
+        """, unsafe_allow_html=True)
     
-    # Display formula
-    st.markdown(f'<div class="formula-display">Formula: {formula} = {result:.4f}</div>', unsafe_allow_html=True)
+        # Display formula
+        st.markdown(f'<div class="formula-display">Formula: {conversion.formula} = {result:.4f}</div>', unsafe_allow_html=True)
     
-    # Add to history
-    if len(st.session_state.history) >= 5:
-        st.session_state.history.pop(0)
-    st.session_state.history.append(f"{value:.4f} {from_unit} → {result:.4f} {to_unit}")
+        # Add to history, skipping reruns that repeat the previous conversion
+        history = session_history()
+        last = history.last()
+        if last is None or last[:4] != (unitconvert.get_category(selected_unit).id, from_unit, to_unit, value):
+            history.add(selected_unit, from_unit, to_unit, value, result)
+
+    st.session_state.panel_seconds = time.perf_counter() - panel_started
+    panel_latency().record(st.session_state.panel_seconds)
+
+converter_panel(selected_unit, units)
 
 # Additional features card
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.markdown("### Quick Reference")
 
-if selected_unit == "Length":
-    reference_data = {
-        "Unit": ["meter", "kilometer", "inch", "foot", "mile"],        "Equivalent": ["1 meter", "1000 meters", "0.0254 meters", "0.3048 meters", "1609.34 meters"]
-    }
-elif selected_unit == "Weight":
-    reference_data = {
-        "Unit": ["kilogram", "gram", "pound", "ounce", "ton"],
-        "Equivalent": ["1 kilogram", "0.001 kilograms", "0.453592 kilograms", "0.0283495 kilograms", "1000 kilograms"]
-    }
-elif selected_unit == "Temperature":
-    reference_data = {
-        "Unit": ["celsius", "fahrenheit", "kelvin"],
-        "Freezing Point": ["0°C", "32°F", "273.15K"],
-        "Boiling Point": ["100°C", "212°F", "373.15K"]
-    }
-elif selected_unit == "Volume":
-    reference_data = {
-        "Unit": ["liter", "milliliter", "gallon (US)", "cup (US)", "fluid ounce (US)"],
-        "Equivalent": ["1 liter", "0.001 liters", "3.78541 liters", "0.236588 liters", "0.0295735 liters"]
-    }
-elif selected_unit == "Time":
-    reference_data = {
-        "Unit": ["second", "minute", "hour", "day", "year"],
-        "Equivalent": ["1 second", "60 seconds", "3600 seconds", "86400 seconds", "31536000 seconds"]
-    }
-elif selected_unit == "Data":
-    reference_data = {
-        "Unit": ["byte", "kilobyte", "megabyte", "gigabyte", "terabyte"],
-        "Equivalent": ["1 byte", "1024 bytes", "1048576 bytes", "1073741824 bytes", "1099511627776 bytes"]
-    }
-elif selected_unit == "Area":
-    reference_data = {
-        "Unit": ["square meter", "square kilometer", "acre", "hectare"],
-        "Equivalent": ["1 m²", "1,000,000 m²", "4046.86 m²", "10,000 m²"]
-    }
-elif selected_unit == "Speed":
-    reference_data = {
-        "Unit": ["meter per second", "kilometer per hour", "mile per hour", "knot"],
-        "Equivalent": ["1 m/s", "3.6 km/h", "2.237 mph", "1.944 knots"]
-    }
-elif selected_unit == "Energy":
-    reference_data = {
-        "Unit": ["joule", "kilojoule", "kilocalorie", "watt hour", "kilowatt hour"],
-        "Equivalent": ["1 J", "1000 J", "4184 J", "3600 J", "3.6×10⁶ J"]
-    }
-elif selected_unit == "Pressure":
-    reference_data = {
-        "Unit": ["pascal", "kilopascal", "bar", "atmosphere", "psi"],
-        "Equivalent": ["1 Pa", "1000 Pa", "100000 Pa", "101325 Pa", "6894.76 Pa"]
-    }
-elif selected_unit == "Power":
-    reference_data = {
-        "Unit": ["watt", "kilowatt", "horsepower", "british thermal unit per hour"],
-        "Equivalent": ["1 W", "1000 W", "745.7 W", "0.293071 W"]
-    }
-elif selected_unit == "Frequency":
-    reference_data = {
-        "Unit": ["hertz", "kilohertz", "megahertz", "gigahertz"],
-        "Equivalent": ["1 Hz", "1000 Hz", "1000000 Hz", "1000000000 Hz"]
-    }
-
-reference_df = pd.DataFrame(reference_data)
-st.dataframe(reference_df, use_container_width=True, hide_index=True)
+st.markdown(reference_text(selected_unit))
 st.markdown('</div>', unsafe_allow_html=True)
 
+# Bulk file conversion
+with st.expander("📁 Bulk file conversion"):
+    render_bulk_conversion(selected_unit.lower(), units)
+
+# Live conversion of a sensor feed
+with st.expander("📡 Live feed", expanded=st.session_state.get('live_feed') is not None):
+    render_live_feed(selected_unit.lower())
+
 # Footer
 st.markdown('<div class="footer">', unsafe_allow_html=True)
 st.markdown("©2025 Made With Stremlit By Talal Shoaib | UniConvert Pro", unsafe_allow_html=True)
 st.markdown("</div>", unsafe_allow_html=True)
 
 # Easter egg - hidden feature
-if st.session_state.history and len(st.session_state.history) > 3:
+if len(session_history()) > 3:
     st.markdown('<div style="text-align: center; margin-top: 20px; font-size: 12px; color: var(--text-light);">🎉 You\'ve unlocked dark mode pro! Keep converting!</div>', unsafe_allow_html=True)
 
 # Add touch feedback for buttons
@@ -701,3 +653,22 @@ def add_touch_feedback():
 # Call the touch feedback function
 add_touch_feedback()
 
+# Admin-only instrumentation panel
+if is_admin():
+    render_admin_panel()
+
+# Record how long this run took and check the p99 latency budget
+run_seconds = time.perf_counter() - run_started
+st.session_state.run_seconds = run_seconds
+latency = rerun_latency()
+latency.record(run_seconds)
+if latency.count % 100 == 0 and not latency.within_budget(LATENCY_BUDGET_MS / 1000):
+    logger.warning("p99 rerun latency %.1f ms exceeds the %.0f ms budget",
+                   latency.percentile(99) * 1000, LATENCY_BUDGET_MS)
+
+# Per-session statistics, and eviction of sessions that have gone idle
+ctx = get_script_run_ctx()
+if ctx is not None:
+    tracker = session_tracker()
+    tracker.record_run(ctx.session_id, run_seconds, deep_sizeof(st.session_state.to_dict()), ctx.session_state)
+    tracker.evict_idle(IDLE_EVICT_SECONDS, evict_session_data)
@@ -0,0 +1,84 @@
+"""Headless checks of the Streamlit page (``UnitC.py``) through AppTest.
+
+AppTest always reruns the whole page, so the converter panel (an
+``st.fragment``) runs once per interaction here; in a live app only the
+panel reruns for value and unit changes.
+"""
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "UnitC.py"
+
+
+@pytest.fixture
+def app():
+    app = AppTest.from_file(str(APP_PATH), default_timeout=30)
+    app.run()
+    assert not app.exception
+    return app
+
+
+def runs(app):
+    return app.session_state["script_runs"], app.session_state["panel_runs"]
+
+
+def assert_one_run(app, before):
+    assert not app.exception
+    after = runs(app)
+    assert (after[0] - before[0], after[1] - before[1]) == (1, 1)
+
+
+def test_first_run_shows_length(app):
+    assert app.session_state["selected_unit"] == "Length"
+    assert runs(app) == (1, 1)
+
+
+def test_select_category(app):
+    before = runs(app)
+    app.button(key="category_weight").click().run()
+    assert_one_run(app, before)
+    assert app.session_state["selected_unit"] == "Weight"
+    assert app.selectbox(key="from_unit_select").value == "kilogram"
+
+
+def test_swap_units(app):
+    from_unit, to_unit = app.session_state["from_unit"], app.session_state["to_unit"]
+    assert from_unit != to_unit
+    before = runs(app)
+    app.button(key="swap_button").click().run()
+    assert_one_run(app, before)
+    assert (app.session_state["from_unit"], app.session_state["to_unit"]) == (to_unit, from_unit)
+    assert app.selectbox(key="from_unit_select").value == to_unit
+    assert app.selectbox(key="to_unit_select").value == from_unit
+
+
+def test_change_value(app):
+    before = runs(app)
+    app.number_input(key="value_input").set_value(5.0).run()
+    assert_one_run(app, before)
+    assert app.session_state["value_input"] == 5.0
+
+
+def test_change_unit(app):
+    before = runs(app)
+    select = app.selectbox(key="to_unit_select")
+    unit = select.options[2]
+    select.select_index(2).run()
+    assert_one_run(app, before)
+    assert app.session_state["to_unit"] == unit
+
+
+def test_search_units(app):
+    app.button(key="category_weight").click().run()
+    before = runs(app)
+    app.text_input(key="unit_search").input("5 ft to m").run()
+    assert_one_run(app, before)
+    assert app.session_state["selected_unit"] == "Length"
+    assert (app.session_state["from_unit"], app.session_state["to_unit"]) == ("foot", "meter")
+    assert app.session_state["value_input"] == 5.0
+    assert app.selectbox(key="from_unit_select").value == "foot"
+    assert app.selectbox(key="to_unit_select").value == "meter"
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from unitconvert.binary import convert_binary_file
+
+
+@pytest.fixture
+def feet(tmp_path):
+    path = tmp_path / "feet.f8"
+    np.arange(1000, dtype=np.float64).tofile(path)
+    return path
+
+
+def test_in_place(feet):
+    assert convert_binary_file("length", feet, "foot", "inch", window_bytes=800) == 8000
+    assert np.array_equal(np.fromfile(feet), np.arange(1000) * 12.0)
+
+
+def test_into_output(feet, tmp_path):
+    output = tmp_path / "inches.f8"
+    convert_binary_file("length", feet, "foot", "inch", output=output, window_bytes=800)
+    assert np.array_equal(np.fromfile(output), np.arange(1000) * 12.0)
+    assert np.array_equal(np.fromfile(feet), np.arange(1000.0))
+
+
+@pytest.mark.parametrize("alias", ["same", "relative", "link"])
+def test_output_naming_the_input_converts_in_place(feet, alias, monkeypatch):
+    monkeypatch.chdir(feet.parent)
+    if alias == "same":
+        output = feet
+    elif alias == "relative":
+        output = os.path.join("..", feet.parent.name, feet.name)
+    else:
+        output = feet.parent / "link.f8"
+        os.symlink(feet, output)
+    convert_binary_file("temperature", feet, "celsius", "fahrenheit", output=output, window_bytes=800)
+    assert np.allclose(np.fromfile(feet), np.arange(1000) * 1.8 + 32)
+
+
+def test_rejects_partial_values(tmp_path):
+    path = tmp_path / "odd.f8"
+    path.write_bytes(b"\0" * 12)
+    with pytest.raises(ValueError, match="not a whole number"):
+        convert_binary_file("length", path, "foot", "inch")
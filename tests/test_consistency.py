@@ -0,0 +1,9 @@
+import pytest
+
+from unitconvert.consistency import run
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_conversion_tables_are_consistent(seed):
+    failures = {name: found for name, found in run(samples=20_000, seed=seed).items() if found}
+    assert not failures
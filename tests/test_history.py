@@ -0,0 +1,104 @@
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from unitconvert import history
+from unitconvert.history import HistoryStore
+
+
+def rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT user, category, from_unit, to_unit, value FROM history ORDER BY timestamp").fetchall()
+
+
+def test_ring_buffer_keeps_the_newest_records():
+    store = HistoryStore(capacity=3)
+    for value in range(5):
+        store.add("length", "meter", "foot", value, value * 3.28, timestamp=value)
+    assert len(store) == 3
+    assert [record.value for record in store.records()] == [4, 3, 2]
+    assert [record.value for record in store] == [2, 3, 4]
+    assert store.last().value == 4
+
+
+def test_records_filter_by_category_and_limit():
+    store = HistoryStore()
+    store.add("length", "meter", "foot", 1, 3.28)
+    store.add("Weight", "kilogram", "pound", 2, 4.4)
+    store.add("length", "foot", "inch", 3, 36)
+    assert [record.value for record in store.records(category="length")] == [3, 1]
+    assert [record.category for record in store.records(category="Weight")] == ["weight"]
+    assert len(store.records(limit=2)) == 2
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        HistoryStore(capacity=0)
+
+
+def test_sqlite_reload_is_per_user(tmp_path):
+    path = tmp_path / "history.db"
+    for user, value in (("ada", 1), ("bob", 2), ("ada", 3)):
+        store = HistoryStore(path=path, user=user)
+        store.add("length", "meter", "foot", value, value * 3.28)
+        store.close()
+    assert [record.value for record in HistoryStore(path=path, user="ada").records()] == [3, 1]
+    assert [record.value for record in HistoryStore(path=path, user="bob").records()] == [2]
+    assert len(HistoryStore(path=path, user="carol")) == 0
+
+
+def test_reload_skips_units_no_longer_defined(tmp_path):
+    path = tmp_path / "history.db"
+    with sqlite3.connect(path) as db:
+        db.executescript(history._SCHEMA)
+        db.execute("INSERT INTO history VALUES ('ada', 'length', 'cubit', 'meter', 1, 0.45, 1)")
+        db.execute("INSERT INTO history VALUES ('ada', 'length', 'foot', 'meter', 1, 0.3048, 2)")
+    assert [record.from_unit for record in HistoryStore(path=path, user="ada").records()] == ["foot"]
+
+
+def test_batch_is_written_when_full(tmp_path):
+    path = tmp_path / "history.db"
+    store = HistoryStore(path=path, batch_size=3, flush_seconds=3600)
+    for value in range(2):
+        store.add("length", "meter", "foot", value, 0, timestamp=100 + value)
+    assert rows(path) == []
+    store.add("length", "meter", "foot", 2, 0, timestamp=102)
+    assert len(rows(path)) == 3
+
+
+def test_batch_is_written_when_its_oldest_record_is_due(tmp_path):
+    path = tmp_path / "history.db"
+    store = HistoryStore(path=path, batch_size=50, flush_seconds=5)
+    store.add("length", "meter", "foot", 1, 0, timestamp=100)
+    store.add("length", "meter", "foot", 2, 0, timestamp=104)
+    assert rows(path) == []
+    store.add("length", "meter", "foot", 3, 0, timestamp=105)
+    assert [row[-1] for row in rows(path)] == [1, 2, 3]
+
+
+def test_open_stores_are_flushed_at_exit(tmp_path):
+    path = tmp_path / "history.db"
+    code = (
+        "from unitconvert.history import HistoryStore\n"
+        f"store = HistoryStore(path={str(path)!r}, user='ada')\n"
+        "store.add('length', 'meter', 'foot', 7, 22.9)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parent.parent)
+    assert rows(path) == [("ada", "length", "meter", "foot", 7)]
+
+
+def test_close_flushes_and_later_adds_stay_in_memory(tmp_path):
+    path = tmp_path / "history.db"
+    store = HistoryStore(path=path, user="ada")
+    store.add("length", "meter", "foot", 1, 3.28)
+    store.close()
+    assert store not in history._OPEN_STORES
+    assert len(rows(path)) == 1
+    store.close()  # evicted sessions may be closed again
+    store.add("length", "meter", "foot", 2, 6.56)
+    store.flush()
+    assert len(store) == 2
+    assert len(rows(path)) == 1
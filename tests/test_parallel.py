@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from unitconvert import parallel
+from unitconvert.batch import convert_array
+from unitconvert.parallel import SharedArray, convert_array_parallel
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(parallel, "MIN_CHUNK", 10)
+
+
+def test_converts_shared_arrays_in_place():
+    values = np.arange(100, dtype=np.float64)
+    with SharedArray.from_values(values) as shared:
+        result = convert_array_parallel("temperature", shared, "celsius", "fahrenheit", workers=3)
+        assert np.shares_memory(result, shared.array)
+        assert np.allclose(shared.array, values * 1.8 + 32)
+
+
+def test_converts_into_a_second_shared_array():
+    values = np.arange(100, dtype=np.float64)
+    with SharedArray.from_values(values) as shared, SharedArray(100) as out:
+        convert_array_parallel("length", shared, "foot", "meter", out=out, workers=2)
+        assert np.allclose(out.array, values * 0.3048)
+        assert np.array_equal(shared.array, values)
+
+
+def test_rejects_mismatched_out():
+    with SharedArray(100) as shared, SharedArray(50) as out, pytest.raises(ValueError):
+        convert_array_parallel("length", shared, "foot", "meter", out=out, workers=2)
+
+
+def test_ordinary_arrays_are_converted_in_process():
+    values = np.arange(100, dtype=np.float64)
+    assert np.allclose(convert_array("length", values, "foot", "meter", workers=4), values * 0.3048)
@@ -0,0 +1,165 @@
+import copy
+from fractions import Fraction
+
+import pytest
+
+from unitconvert import plugins, registry
+from unitconvert.engine import convert, formula
+from unitconvert.plugins import PluginUnits, install, load, load_snapshot, parse, save_snapshot
+from unitconvert.reference import reference_markdown, reference_table
+from unitconvert.registry import ALIASES, CATEGORIES, GROUPS
+
+FORCE = """
+[units.length]
+furlong = "220 yard"
+chain = "1/10 furlong"
+
+[units.temperature]
+rankine = { scale = "5/9", offset = 0 }
+
+[aliases.length]
+furlong = ["fur"]
+
+[categories.force]
+name = "Force"
+group = "Science"
+symbol = "N"
+dimension = { kg = 1, m = 1, s = -2 }
+reference = ["newton", "kilonewton"]
+units = { newton = 1, kilonewton = 1000, "pound-force" = "4.4482216152605" }
+"""
+
+
+@pytest.fixture
+def restore_registry():
+    """Undo every install() made by the test."""
+    categories, aliases, groups = dict(CATEGORIES), copy.deepcopy(ALIASES), dict(GROUPS)
+    yield
+    changed = set(CATEGORIES) | set(categories)
+    CATEGORIES.clear()
+    CATEGORIES.update(categories)
+    ALIASES.clear()
+    ALIASES.update(aliases)
+    GROUPS.clear()
+    GROUPS.update(groups)
+    for category_id in changed:
+        plugins._invalidate(category_id)
+
+
+def write(tmp_path, text, name="units.toml"):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_parse_resolves_sizes_and_aliases(tmp_path):
+    parsed = parse([write(tmp_path, FORCE)])
+    sizes = {(category, unit): size for category, unit, size in parsed.units}
+    assert sizes["length", "furlong"] == 220 * CATEGORIES["length"].factors["yard"]
+    assert sizes["length", "chain"] == sizes["length", "furlong"] / 10
+    assert sizes["temperature", "rankine"] == (Fraction(5, 9), 0)
+    assert sizes["force", "pound-force"] == Fraction("4.4482216152605")
+    assert parsed.aliases == [("length", "furlong", "fur")]
+    assert parsed.categories["force"]["dimension"] == {"kg": 1, "m": 1, "s": -2}
+
+
+@pytest.mark.parametrize("text, message", [
+    ("[units.nope]\nx = 1\n", "units.nope: unknown category"),
+    ("[units.length]\nmeter = 2\n", "units.length.meter: unit already defined"),
+    ("[units.length]\nx = -1\n", "unit size must be positive"),
+    ("[units.length]\nx = \"3 parsec\"\n", "is not a number or '<number> <unit>'"),
+    ("[units.temperature]\nx = 2\n", "affine units need"),
+    ("[aliases.length]\nzz = [\"z\"]\n", "aliases.length.zz: unknown unit"),
+    ("[aliases.length]\nmeter = \"m2\"\n", "aliases must be a list of strings"),
+    ("[categories.torque]\ndimension = { q = 1 }\nunits = { nm = 1 }\n", "dimension bases must be among"),
+    ("[categories.torque]\nunits = { nm = 2 }\n", "the first unit is the base unit"),
+    ("[categories.torque]\nname = \"Twist\"\nunits = { nm = 1 }\n", "name must match the key"),
+    ("[categories.length]\nunits = { x = 1 }\n", "category already exists"),
+    ("[categories.torque]\nreference = [\"x\"]\nunits = { nm = 1 }\n", "reference lists unknown unit"),
+    ("[extra]\n", "unknown section"),
+])
+def test_parse_rejects_invalid_files(tmp_path, text, message):
+    with pytest.raises(ValueError, match=message):
+        parse([write(tmp_path, text)])
+
+
+def test_aliases_for_builtin_units_need_no_units_section(tmp_path):
+    parsed = parse([write(tmp_path, '[aliases.length]\nmeter = ["metr"]\n')])
+    assert parsed.aliases == [("length", "meter", "metr")]
+
+
+def test_json_files_use_the_same_format(tmp_path):
+    path = write(tmp_path, '{"units": {"length": {"furlong": "220 yard"}}}', "units.json")
+    assert parse([path]).units == [("length", "furlong", 220 * CATEGORIES["length"].factors["yard"])]
+
+
+def test_snapshot_round_trip(tmp_path):
+    parsed = parse([write(tmp_path, FORCE)])
+    save_snapshot(parsed, tmp_path / "snapshot.npz")
+    assert load_snapshot(tmp_path / "snapshot.npz") == parsed
+
+
+def test_load_writes_and_reuses_a_snapshot(tmp_path, monkeypatch):
+    path = write(tmp_path, FORCE)
+    cache = tmp_path / "cache"
+    parsed = load([path], cache)
+    assert len(list(cache.glob("plugins-*.npz"))) == 1
+    monkeypatch.setattr(plugins, "parse", lambda paths: pytest.fail("parsed again"))
+    assert load([path], cache) == parsed
+
+
+def test_snapshot_key_follows_file_contents(tmp_path):
+    path = write(tmp_path, FORCE)
+    key = plugins.snapshot_key([path])
+    path.write_text(FORCE + "\n")
+    assert plugins.snapshot_key([path]) != key
+
+
+def test_install_extends_every_table(tmp_path, restore_registry):
+    from unitconvert.batch import convert_array
+    from unitconvert.expression import evaluate
+    from unitconvert.search import default_index
+
+    install(parse([write(tmp_path, FORCE)]))
+    assert convert("length", 1, "furlong", "meter") == pytest.approx(201.168)
+    assert convert("force", 1, "kilonewton", "newton") == 1000
+    assert convert_array("force", [1.0, 2.0], "newton", "kilonewton").tolist() == [0.001, 0.002]
+    assert default_index().lookup("fur") == [("length", "furlong")]
+    assert evaluate("2 furlong to ft") == pytest.approx(1320)
+    assert [category.id for category in GROUPS["Science"]][-1] == "force"
+
+
+def test_install_rejects_units_already_defined(tmp_path, restore_registry):
+    parsed = parse([write(tmp_path, "[units.length]\nfurlong = \"220 yard\"\n")])
+    install(parsed)
+    with pytest.raises(ValueError, match="Length already defines furlong"):
+        install(parsed)
+
+
+def test_install_keeps_definition_order(tmp_path, restore_registry):
+    text = "".join(f'[categories.{name}]\nunits = {{ {name[0]} = 1 }}\n' for name in ("zeta", "alpha", "mu"))
+    install(parse([write(tmp_path, text)]))
+    assert [category.id for category in GROUPS["Plugins"]] == ["zeta", "alpha", "mu"]
+
+
+def test_affine_plugin_units_get_a_formula(tmp_path, restore_registry):
+    install(parse([write(tmp_path, FORCE)]))
+    assert convert("temperature", 0, "celsius", "rankine") == pytest.approx(491.67)
+    assert formula("temperature", 0, "celsius", "rankine") == "0 × 1.8 + 491.67"
+    assert formula("temperature", 5, "rankine", "rankine") == "No conversion needed"
+
+
+def test_affine_plugin_category_reference_table(tmp_path, restore_registry):
+    install(parse([write(tmp_path, """
+[categories.gauge]
+kind = "affine"
+reference = ["absolute", "gauge"]
+units = { absolute = { scale = 1, offset = 0 }, gauge = { scale = 1, offset = "101.325" } }
+""")]))
+    assert reference_table("gauge") == {
+        "Unit": ["absolute", "gauge"],
+        "Zero": ["0 absolute", "101.325 absolute"],
+        "One": ["1 absolute", "102.325 absolute"],
+    }
+    assert "Freezing Point" in reference_markdown("temperature")
+    assert registry.get_category("gauge").kind == registry.AFFINE
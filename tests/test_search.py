@@ -0,0 +1,72 @@
+import pytest
+
+from unitconvert.dimensions import exact_compound_factor
+from unitconvert.expression import compile_expression, evaluate
+from unitconvert.registry import LINEAR, Category
+from unitconvert.search import UnitIndex, default_index
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("MW", [("power", "megawatt")]),
+    ("mW", []),
+    ("mg", [("weight", "milligram")]),
+    ("Mg", []),
+    ("MPa", [("pressure", "megapascal")]),
+    ("mPa", []),
+    ("MB", [("data", "megabyte")]),
+    ("Mb", []),
+    ("kwh", [("energy", "kilowatt hour")]),
+    ("KWH", [("energy", "kilowatt hour")]),
+    ("Kilometers", [("length", "kilometer")]),
+    ("kn", [("speed", "knot")]),
+])
+def test_symbol_case(term, expected):
+    assert default_index().lookup(term) == expected
+
+
+@pytest.mark.parametrize("text", ["1 mW to W", "1 Mg to kg", "1 mPa to Pa", "1 Mb to kB"])
+def test_expressions_do_not_swap_prefixes(text):
+    with pytest.raises(ValueError):
+        compile_expression(text)
+
+
+@pytest.mark.parametrize("text, result", [
+    ("1 MW to W", 1e6),
+    ("1 mg to g", 1e-3),
+    ("1 MPa to kPa", 1e3),
+    ("1 kwh to kj", 3600),
+    ("100 C to F", 212),
+    ("2 kN·m to J", 2000),
+    ("10 Nm to J", 10),
+    ("1 kn to km/h", 1.852),
+])
+def test_cased_expressions(text, result):
+    assert evaluate(text) == pytest.approx(result)
+
+
+def test_kilonewton_is_not_knot():
+    assert exact_compound_factor("kN·m", "J") == 1000
+    assert exact_compound_factor("kNm", "N·m") == 1000
+    with pytest.raises(ValueError, match="Cannot convert"):
+        exact_compound_factor("kn·m", "J")
+
+
+def test_resolve_query():
+    resolution = default_index().resolve("5 ft to m")
+    assert (resolution.value, resolution.category, resolution.from_unit, resolution.to_unit) == \
+        (5.0, "length", "foot", "meter")
+
+
+def test_typo_search_finds_the_unit():
+    assert default_index().search("kilomter")[0].unit == "kilometer"
+
+
+def test_typo_search_on_a_large_index():
+    categories = {
+        f"synthetic{i}": Category(f"synthetic{i}", f"Synthetic {i}", LINEAR,
+                                  tuple(f"unit{i}x{j}" for j in range(100)), {})
+        for i in range(50)
+    }
+    index = UnitIndex(categories, {})
+    assert index.search("unti4x7")[0].unit == "unit4x7"
+    assert {match.unit for match in index.search("unit4x7", limit=500)} >= {"unit4x70", "unit4x7"}
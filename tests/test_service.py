@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+
+from unitconvert import service
+
+
+def request(method, path, payload=None, body=None):
+    """Send one request through the ASGI app; return ``(status, decoded body)``."""
+    if body is None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(service.app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def convert(**fields):
+    return request("POST", "/convert", {"category": "length", "from": "foot", "to": "meter", **fields})
+
+
+def batch(**fields):
+    return request("POST", "/convert/batch", {"category": "length", "from": "foot", "to": "meter", **fields})
+
+
+def test_convert():
+    assert convert(value=5) == (200, {"result": pytest.approx(1.524)})
+
+
+def test_batch():
+    status, payload = batch(values=[1, 2.5])
+    assert status == 200
+    assert payload["results"] == pytest.approx([0.3048, 0.762])
+
+
+def test_large_batches_run_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(service, "OFFLOAD_BYTES", 0)
+    status, payload = batch(values=[1.0] * 1000)
+    assert status == 200
+    assert payload["results"] == pytest.approx([0.3048] * 1000)
+
+
+@pytest.mark.parametrize("fields", [
+    {"category": ["length"]},
+    {"from": ["foot"]},
+    {"to": {"unit": "meter"}},
+    {"category": 3},
+])
+def test_non_string_fields_are_rejected(fields):
+    for send in (convert, batch):
+        status, payload = send(value=1, values=[1], **fields)
+        assert status == 400
+        assert payload == {"error": "'category', 'from' and 'to' must be strings"}
+
+
+@pytest.mark.parametrize("value", ["1.5", True, None, [1], float("nan"), float("inf")])
+def test_convert_rejects_non_numbers(value):
+    status, payload = convert(value=value)
+    assert status == 400
+    assert "finite number" in payload["error"]
+
+
+@pytest.mark.parametrize("values", [["1.5"], [None], [True], [[1, 2]], "1,2", [float("nan")]])
+def test_batch_rejects_non_numbers(values):
+    status, payload = batch(values=values)
+    assert status == 400
+    assert "'values' must be" in payload["error"]
+
+
+def test_results_out_of_range_are_rejected():
+    assert request("POST", "/convert", {"category": "length", "from": "mile", "to": "meter",
+                                        "value": 1e308})[0] == 400
+    assert request("POST", "/convert/batch", {"category": "length", "from": "mile", "to": "meter",
+                                              "values": [1, 1e308]})[0] == 400
+
+
+@pytest.mark.parametrize("body, error", [
+    (b"{not json", "Request body must be valid JSON"),
+    (b"[1, 2]", "Request must include 'category', 'from' and 'to'"),
+    (json.dumps({"category": "length", "from": "foot"}).encode(), "Request must include"),
+])
+def test_malformed_requests(body, error):
+    status, payload = request("POST", "/convert", body=body)
+    assert status == 400
+    assert payload["error"].startswith(error)
+
+
+def test_unknown_units_are_a_client_error():
+    status, payload = convert(value=1, to="parsec")
+    assert status == 400
+
+
+def test_routing_errors():
+    assert request("GET", "/nope")[0] == 404
+    assert request("GET", "/convert")[0] == 405
+    assert request("GET", "/health") == (200, {"status": "ok"})
+
+
+def test_oversized_bodies(monkeypatch):
+    monkeypatch.setattr(service, "MAX_BODY_BYTES", 10)
+    assert convert(value=1)[0] == 413
@@ -0,0 +1,22 @@
+from unitconvert.stream import LiveConversion, LiveFeed
+
+
+def feed(spec):
+    return LiveFeed(LiveConversion("temperature", "celsius", "fahrenheit"), spec).start()
+
+
+def test_stop_cancels_a_running_feed():
+    live = feed("simulated:1000")
+    assert live.running
+    live.stop()
+    assert not live.running
+    assert live.error is None
+
+
+def test_stop_after_the_feed_ends_between_check_and_cancel(monkeypatch):
+    live = feed("tcp://127.0.0.1:1")  # refused, so the feed ends by itself
+    live._thread.join(2)
+    assert isinstance(live.error, OSError)
+    assert live._loop.is_closed()
+    monkeypatch.setattr(LiveFeed, "running", property(lambda self: True))
+    live.stop()
@@ -0,0 +1,40 @@
+"""Headless unit conversion engine used by the UniConvert Pro app.
+
+Importing this package does not pull in Streamlit, so batch jobs and other
+services can use the same conversion tables as the UI.  Plugin files named
+in ``UNICONVERT_PLUGINS`` are installed on import (see
+:mod:`unitconvert.plugins`).
+"""
+import os
+
+from .engine import (
+    Conversion,
+    conversion,
+    conversion_factor,
+    convert,
+    convert_exact,
+    exact_conversion_factor,
+    formula,
+)
+from .registry import AFFINE, ALIASES, CATEGORIES, GROUPS, LINEAR, Category, get_category
+
+if os.environ.get("UNICONVERT_PLUGINS"):
+    from .plugins import load_from_environment
+    load_from_environment()
+
+__all__ = [
+    "AFFINE",
+    "ALIASES",
+    "CATEGORIES",
+    "GROUPS",
+    "LINEAR",
+    "Category",
+    "Conversion",
+    "conversion",
+    "conversion_factor",
+    "convert",
+    "convert_exact",
+    "exact_conversion_factor",
+    "formula",
+    "get_category",
+]
@@ -0,0 +1,127 @@
+"""Vectorized conversions over NumPy arrays and pandas Series.
+
+A whole buffer is converted with one multiply (plus one add for affine
+categories such as temperature) using the same precomputed factors as the
+scalar engine.  Each category also gets a dense N×N factor matrix so that
+buffers mixing many different unit pairs convert in a single pass.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .engine import conversion_factor
+from .registry import AFFINE, CATEGORIES, get_category
+
+
+class FactorMatrix(NamedTuple):
+    units: tuple
+    index: dict
+    multipliers: np.ndarray
+    offsets: object  # N×N ndarray for affine categories, None otherwise
+
+
+# Above this many units a linear matrix is built from float unit sizes
+# instead of pair by pair from the exact factors (within an ulp or two)
+EXACT_MATRIX_LIMIT = 64
+
+
+def _build_matrix(category):
+    size = len(category.units)
+    offsets = np.zeros((size, size), dtype=np.float64)
+    if category.kind != AFFINE and size > EXACT_MATRIX_LIMIT:
+        sizes = np.array([float(category.factors[unit]) for unit in category.units])
+        multipliers = sizes[:, None] / sizes[None, :]
+    else:
+        multipliers = np.empty((size, size), dtype=np.float64)
+        for i, from_unit in enumerate(category.units):
+            for j, to_unit in enumerate(category.units):
+                multipliers[i, j], offsets[i, j] = conversion_factor(category.id, from_unit, to_unit)
+    multipliers.flags.writeable = False
+    offsets.flags.writeable = False
+    return FactorMatrix(
+        category.units,
+        {unit: i for i, unit in enumerate(category.units)},
+        multipliers,
+        offsets if category.kind == AFFINE else None,
+    )
+
+
+MATRICES = {category_id: _build_matrix(category) for category_id, category in CATEGORIES.items()}
+
+
+def factor_matrix(category):
+    """Return the precomputed :class:`FactorMatrix` for a category."""
+    category = get_category(category)
+    matrix = MATRICES.get(category.id)
+    if matrix is None:  # registered by a plugin after import
+        matrix = MATRICES[category.id] = _build_matrix(category)
+    return matrix
+
+
+def invalidate(category_id):
+    """Forget the factor matrix of a category whose units changed."""
+    MATRICES.pop(category_id, None)
+
+
+def unit_indices(category, units):
+    """Map an array of unit names to row/column indices of the factor matrix."""
+    index = factor_matrix(category).index
+    names, inverse = np.unique(np.asarray(units), return_inverse=True)
+    try:
+        lookup = np.array([index[name] for name in names.tolist()], dtype=np.intp)
+    except KeyError as exc:
+        raise ValueError(f"Unknown unit {exc.args[0]!r} for {get_category(category).name}") from None
+    return lookup[inverse]
+
+
+def _as_float_array(values):
+    array = np.asarray(values)
+    if array.dtype.kind != 'f':
+        array = array.astype(np.float64)
+    return array
+
+
+def convert_array(category, values, from_unit, to_unit, out=None, workers=1):
+    """Convert every element of ``values`` from ``from_unit`` to ``to_unit``.
+
+    ``values`` may be any array-like or a pandas Series; a Series comes back
+    as a Series with the same index and name.  Pass ``out`` (which may be
+    ``values`` itself) to write the result into an existing float array
+    instead of allocating a new one.  ``workers > 1`` (or ``None`` for one
+    per CPU) splits a large :class:`~unitconvert.parallel.SharedArray`
+    across processes that convert it in place, see
+    :func:`unitconvert.parallel.convert_array_parallel`.
+    """
+    if workers != 1:
+        from .parallel import convert_array_parallel
+        result = convert_array_parallel(category, values, from_unit, to_unit, out=out, workers=workers)
+    else:
+        multiplier, offset = conversion_factor(category, from_unit, to_unit)
+        result = np.multiply(_as_float_array(values), multiplier, out=out)
+        if offset:
+            np.add(result, offset, out=result)
+    if hasattr(values, "index") and hasattr(values, "name"):
+        return type(values)(result, index=values.index, name=values.name, copy=False)
+    return result
+
+
+def _as_indices(category, units):
+    units = np.asarray(units)
+    if units.dtype.kind in 'iu':
+        return units
+    return unit_indices(category, units)
+
+
+def convert_mixed(category, values, from_units, to_units, out=None):
+    """Convert values whose source and target units vary element by element.
+
+    ``from_units`` and ``to_units`` are arrays (or scalars) of unit names or of
+    indices into the category's factor matrix, broadcast against ``values``.
+    """
+    matrix = factor_matrix(category)
+    from_index = _as_indices(category, from_units)
+    to_index = _as_indices(category, to_units)
+    result = np.multiply(_as_float_array(values), matrix.multipliers[from_index, to_index], out=out)
+    if matrix.offsets is not None:
+        np.add(result, matrix.offsets[from_index, to_index], out=result)
+    return result
@@ -0,0 +1,280 @@
+"""Throughput benchmarks for the conversion engine.
+
+Run ``python -m unitconvert.bench`` to time every benchmark, or pass
+benchmark names to run a subset.  Every result is a rate (higher is
+better).  ``--save FILE`` stores the results as a JSON baseline and
+``--baseline FILE`` compares against one, exiting with status 1 when any
+result is slower than the baseline by more than ``--threshold``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import timeit
+from decimal import Decimal
+
+from .engine import convert, convert_exact
+from .registry import CATEGORIES
+
+DEFAULT_THRESHOLD = 0.2
+BATCH_SIZES = tuple(10**exponent for exponent in range(3, 9))
+
+
+def _rate(func, number, repeat=3):
+    return number / min(timeit.repeat(func, number=number, repeat=repeat))
+
+
+def bench_exact_vs_float(number=100_000):
+    """Scalar conversions per second in float, Fraction and Decimal modes."""
+    return {
+        "float": _rate(lambda: convert("length", 12.5, "mile", "foot"), number),
+        "exact (Fraction)": _rate(lambda: convert_exact("length", 12.5, "mile", "foot"), number // 10),
+        "exact (Decimal)": _rate(lambda: convert_exact("length", Decimal("12.5"), "mile", "foot"), number // 10),
+    }
+
+
+def bench_scalar(number=100_000):
+    """Scalar float conversions per second for every category."""
+    return {
+        category.id: _rate(lambda: convert(category.id, 12.5, category.units[0], category.units[-1]), number)
+        for category in CATEGORIES.values()
+    }
+
+
+def bench_batch(sizes=BATCH_SIZES):
+    """Values per second of convert_array from 1e3 to 1e8 elements."""
+    import numpy as np
+
+    from .batch import convert_array
+
+    results = {}
+    for size in sizes:
+        values = np.random.default_rng(0).uniform(-100, 100, size)
+        out = np.empty_like(values)
+        number = max(1, 10**6 // size)
+        best = min(timeit.repeat(lambda: convert_array("temperature", values, "celsius", "fahrenheit", out=out),
+                                 number=number, repeat=3))
+        results[f"n={size:.0e}"] = size * number / best
+        del values, out
+    return results
+
+
+def bench_import_time(repeat=5):
+    """Fresh-interpreter imports per second of the package and its heavier modules."""
+    results = {}
+    for module in ("unitconvert", "unitconvert.batch", "unitconvert.files"):
+        code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+        best = min(
+            float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+            for _ in range(repeat)
+        )
+        results[f"import {module}"] = 1 / best
+    return results
+
+
+def bench_parallel_scaling(size=20_000_000, repeat=3):
+    """Values per second of convert_array_parallel on shared arrays as the worker count grows."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    import numpy as np
+
+    from .parallel import SharedArray, convert_array_parallel
+
+    results = {}
+    with SharedArray.from_values(np.random.default_rng(0).uniform(0, 1000, size)) as values, \
+            SharedArray(size) as out:
+        workers = 1
+        while True:
+            with ProcessPoolExecutor(workers) as pool:
+                convert_array_parallel("length", values, "foot", "meter", out=out, workers=workers, executor=pool)
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    convert_array_parallel("length", values, "foot", "meter", out=out, workers=workers,
+                                           executor=pool)
+                    best = min(best, time.perf_counter() - start)
+            results[f"workers={workers}"] = size / best
+            if workers >= (os.cpu_count() or 1):
+                return results
+            workers = min(workers * 2, os.cpu_count() or 1)
+
+
+def bench_page_runs(number=20):
+    """Full page runs per second versus converter panel (fragment) runs per second.
+
+    Times value changes through AppTest using the durations the page records
+    for itself; a live app only pays the panel cost for value and unit edits.
+    """
+    from pathlib import Path
+
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(Path(__file__).resolve().parent.parent / "UnitC.py"), default_timeout=30)
+    app.run()
+    page = panel = 0.0
+    for i in range(number):
+        app.number_input[0].set_value(float(i)).run()
+        page += app.session_state["run_seconds"]
+        panel += app.session_state["panel_seconds"]
+    return {"full page run": number / page, "converter panel run": number / panel}
+
+
+def bench_search_index(number=20_000):
+    """Unit index builds and fuzzy queries per second, on the registry and a synthetic set."""
+    from .registry import Category, LINEAR
+    from .search import UnitIndex
+
+    synthetic = {
+        f"synthetic{i}": Category(f"synthetic{i}", f"Synthetic {i}", LINEAR,
+                                  tuple(f"unit{i}x{j}" for j in range(100)), {})
+        for i in range(50)
+    }
+    index = UnitIndex()
+    large = UnitIndex(synthetic, {})
+    return {
+        "build (registry)": _rate(UnitIndex, 200),
+        "build (5000 units)": _rate(lambda: UnitIndex(synthetic, {}), 5),
+        "exact query": _rate(lambda: index.search("kwh"), number),
+        "typo query": _rate(lambda: index.search("kilomter"), number),
+        "resolve": _rate(lambda: index.resolve("5 ft to m"), number),
+        "typo query (5000 units)": _rate(lambda: large.search("unti4x7"), number // 10),
+    }
+
+
+def bench_expressions(number=100_000):
+    """Expression evaluations per second with and without the compiled plan cache."""
+    from .expression import compile_expression, evaluate
+
+    text = "3 ft 4 in to cm"
+    return {
+        "parse every time": _rate(lambda: compile_expression.__wrapped__(text), number // 10),
+        "cached plan": _rate(lambda: evaluate(text), number),
+        "cached plan, new values": _rate(lambda: compile_expression(text).apply(5, 11), number),
+    }
+
+
+def bench_dimensions(number=100_000):
+    """Compound unit conversions per second, resolving units each time versus cached."""
+    from .dimensions import convert_compound, exact_compound_factor, parse_unit
+
+    def uncached():
+        parse_unit.cache_clear()
+        return exact_compound_factor("kWh/100km", "J/m")
+
+    return {
+        "resolve every time": _rate(uncached, number // 100),
+        "cached factor": _rate(lambda: convert_compound(15.0, "kWh/100km", "J/m"), number),
+    }
+
+
+def bench_stream(readings=200_000):
+    """Readings per second through the live-feed pipeline from an in-memory source."""
+    import asyncio
+
+    from .stream import LiveConversion
+
+    async def source():
+        for i in range(readings):
+            yield float(i)
+            if i % 1000 == 0:
+                await asyncio.sleep(0)
+
+    results = {}
+    for batch_size in (1, 64, 512):
+        conversion = LiveConversion("temperature", "celsius", "fahrenheit", batch_size=batch_size)
+        start = time.perf_counter()
+        asyncio.run(conversion.run(source()))
+        results[f"batch size {batch_size}"] = readings / (time.perf_counter() - start)
+    return results
+
+
+def bench_plugins(units=5000):
+    """Plugin file loads per second: parsing and validating TOML versus reading the snapshot."""
+    import tempfile
+    from pathlib import Path
+
+    from .plugins import load_snapshot, parse, save_snapshot
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.toml"
+        lines = ["[categories.benchmark]", 'name = "Benchmark"', "[categories.benchmark.units]", "unit0 = 1"]
+        lines += [f'unit{i} = "{i}/7"' for i in range(1, units)]
+        path.write_text("\n".join(lines) + "\n")
+        snapshot = Path(directory) / "bench.npz"
+        save_snapshot(parse([path]), snapshot)
+        return {
+            "parse": _rate(lambda: parse([path]), 5),
+            "snapshot": _rate(lambda: load_snapshot(snapshot), 5),
+        }
+
+
+BENCHMARKS = {
+    "scalar": bench_scalar,
+    "batch": bench_batch,
+    "import-time": bench_import_time,
+    "exact-vs-float": bench_exact_vs_float,
+    "parallel-scaling": bench_parallel_scaling,
+    "page-runs": bench_page_runs,
+    "search-index": bench_search_index,
+    "expressions": bench_expressions,
+    "dimensions": bench_dimensions,
+    "stream": bench_stream,
+    "plugins": bench_plugins,
+}
+
+
+def regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """``(name, label, baseline rate, rate)`` for results slower than baseline by over ``threshold``."""
+    found = []
+    for name, rates in results.items():
+        for label, rate in rates.items():
+            expected = baseline.get(name, {}).get(label)
+            if expected is not None and rate < expected * (1 - threshold):
+                found.append((name, label, expected, rate))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m unitconvert.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--baseline", metavar="FILE", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a result counts as a regression (default: %(default)s)")
+    parser.add_argument("--save", metavar="FILE", help="write the results to FILE as a new baseline")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    for name in args.names or BENCHMARKS:
+        print(f"{name}:")
+        results[name] = BENCHMARKS[name]()
+        for label, rate in results[name].items():
+            expected = baseline.get(name, {}).get(label)
+            change = f"  {rate / expected - 1:+7.1%}" if expected else ""
+            print(f"  {label:<24} {rate:>14,.0f} ops/s{change}")
+
+    if args.save:
+        saved = {}
+        if os.path.exists(args.save):
+            with open(args.save) as f:
+                saved = json.load(f)
+        saved.update(results)
+        with open(args.save, "w") as f:
+            json.dump(saved, f, indent=2, sort_keys=True)
+    found = regressions(results, baseline, args.threshold)
+    for name, label, expected, rate in found:
+        print(f"REGRESSION {name} / {label}: {rate:,.0f} ops/s vs baseline {expected:,.0f} ops/s")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
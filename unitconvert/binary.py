@@ -0,0 +1,59 @@
+"""Conversion of raw float32/float64 files through memory maps.
+
+The file is mapped one fixed-size window at a time, so files much larger
+than RAM convert with a small, constant working set.
+"""
+import os
+import time
+
+import numpy as np
+
+from .engine import conversion_factor
+
+DEFAULT_WINDOW_BYTES = 64 * 1024 * 1024
+
+
+def convert_binary_file(category, path, from_unit, to_unit, dtype="float64", output=None,
+                        window_bytes=DEFAULT_WINDOW_BYTES, progress=None):
+    """Convert a headerless file of floats in place, or into ``output``.
+
+    An ``output`` that names the input file itself (by any path or link)
+    converts in place.
+
+    ``dtype`` is any NumPy floating dtype, e.g. ``"float32"`` or ``">f8"``
+    for big-endian data.  ``progress(bytes_done, elapsed_seconds)`` is called
+    after every window.  Returns the number of bytes converted.
+    """
+    multiplier, offset = conversion_factor(category, from_unit, to_unit)
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise ValueError(f"Binary conversion needs a floating-point dtype, not {dtype}")
+    size = os.path.getsize(path)
+    if size % dtype.itemsize:
+        raise ValueError(f"{path} is {size} bytes, not a whole number of {dtype} values")
+
+    count = size // dtype.itemsize
+    if output is not None and os.path.exists(output) and os.path.samefile(path, output):
+        output = None
+    if output is not None:
+        with open(output, "wb") as handle:
+            handle.truncate(size)
+    window = max(1, window_bytes // dtype.itemsize)
+
+    start = time.perf_counter()
+    for first in range(0, count, window):
+        length = min(window, count - first)
+        byte_offset = first * dtype.itemsize
+        if output is None:
+            source = target = np.memmap(path, dtype=dtype, mode="r+", offset=byte_offset, shape=(length,))
+        else:
+            source = np.memmap(path, dtype=dtype, mode="r", offset=byte_offset, shape=(length,))
+            target = np.memmap(output, dtype=dtype, mode="r+", offset=byte_offset, shape=(length,))
+        np.multiply(source, multiplier, out=target)
+        if offset:
+            np.add(target, offset, out=target)
+        target.flush()
+        del source, target
+        if progress is not None:
+            progress(byte_offset + length * dtype.itemsize, time.perf_counter() - start)
+    return size
@@ -0,0 +1,151 @@
+"""Command-line bulk converter streaming stdin to stdout.
+
+    python -m unitconvert length meter foot < values.txt
+    python -m unitconvert temperature fahrenheit celsius --csv --column 2 --skip-header < log.csv
+    python -m unitconvert pressure psi pascal --binary dump.f32 --dtype float32 --output dump_pa.f32
+
+Input is read and converted in chunks of lines, so arbitrarily large inputs
+run in constant memory.  ``--workers`` fans the chunks out across processes
+while keeping the output in input order.  ``--binary`` converts a raw file of
+floats through memory-mapped windows instead of reading stdin.
+"""
+import argparse
+import csv
+import io
+import itertools
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .engine import conversion_factor
+
+DEFAULT_CHUNK_LINES = 50_000
+
+
+def _to_float(text, line_number):
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"line {line_number}: not a number: {text.strip()!r}") from None
+
+
+def convert_lines(task):
+    """Convert one chunk of input lines; returns ``(output_text, values_converted)``."""
+    lines, first_line, multiplier, offset, column, delimiter = task
+    count = 0
+    if column is None:
+        out = []
+        for number, line in enumerate(lines, first_line):
+            text = line.strip()
+            if text:
+                out.append(f"{_to_float(text, number) * multiplier + offset!r}\n")
+                count += 1
+            else:
+                out.append("\n")
+        return "".join(out), count
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\n")
+    for number, row in enumerate(csv.reader(lines, delimiter=delimiter), first_line):
+        if len(row) > column and row[column].strip():
+            row[column] = repr(_to_float(row[column], number) * multiplier + offset)
+            count += 1
+        writer.writerow(row)
+    return buffer.getvalue(), count
+
+
+def _chunks(stream, chunk_lines, first_line, *conversion):
+    while True:
+        lines = list(itertools.islice(stream, chunk_lines))
+        if not lines:
+            return
+        yield (lines, first_line, *conversion)
+        first_line += len(lines)
+
+
+def _results(tasks, workers):
+    if workers <= 1:
+        yield from map(convert_lines, tasks)
+        return
+    # Keep a bounded number of chunks in flight so memory stays flat
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(convert_lines, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _convert_binary(args, stderr):
+    from .binary import convert_binary_file
+
+    start = time.perf_counter()
+    try:
+        size = convert_binary_file(args.category, args.binary, args.from_unit, args.to_unit,
+                                   dtype=args.dtype, output=args.output)
+    except (OSError, TypeError, ValueError) as exc:
+        print(f"error: {exc}", file=stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"converted {size / 2**20:,.1f} MiB in {elapsed:.2f}s "
+          f"({size / 2**20 / max(elapsed, 1e-9):,.1f} MiB/s)", file=stderr)
+    return 0
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+
+    parser = argparse.ArgumentParser(prog="python -m unitconvert",
+                                     description="Convert a stream of numbers from stdin to stdout.")
+    parser.add_argument("category", help="unit category, e.g. length")
+    parser.add_argument("from_unit", help="unit of the input values")
+    parser.add_argument("to_unit", help="unit to convert to")
+    parser.add_argument("--csv", action="store_true", help="treat input as CSV and convert one column")
+    parser.add_argument("--column", type=int, default=0, help="0-based CSV column to convert (default: 0)")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter (default: ',')")
+    parser.add_argument("--skip-header", action="store_true", help="copy the first line through unchanged")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--binary", metavar="PATH",
+                        help="convert a raw float file through memory maps instead of stdin")
+    parser.add_argument("--dtype", default="float64", help="element type of --binary files (default: float64)")
+    parser.add_argument("--output", metavar="PATH", help="write --binary results here instead of in place")
+    parser.add_argument("--chunk-lines", type=int, default=DEFAULT_CHUNK_LINES,
+                        help=f"lines per chunk (default: {DEFAULT_CHUNK_LINES})")
+    args = parser.parse_args(argv)
+
+    try:
+        multiplier, offset = conversion_factor(args.category, args.from_unit, args.to_unit)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.binary:
+        return _convert_binary(args, stderr)
+
+    first_line = 1
+    if args.skip_header:
+        header = stdin.readline()
+        stdout.write(header)
+        first_line += 1 if header else 0
+
+    column = args.column if args.csv else None
+    tasks = _chunks(stdin, args.chunk_lines, first_line, multiplier, offset, column, args.delimiter)
+    total = 0
+    start = time.perf_counter()
+    try:
+        for text, count in _results(tasks, args.workers):
+            stdout.write(text)
+            total += count
+    except ValueError as exc:
+        print(f"error: {exc}", file=stderr)
+        return 1
+    stdout.flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"converted {total:,} values in {elapsed:.2f}s "
+          f"({total / max(elapsed, 1e-9):,.0f} values/s, {args.workers} worker(s))", file=stderr)
+    return 0
@@ -0,0 +1,140 @@
+"""Cold-start budget and warm-up for app and service processes.
+
+:func:`warmup` builds every table that is otherwise constructed on first use
+(the unit search index, the dimensional-analysis unit table, the compiled
+expression cache and the vectorized factor matrices), so the first request
+does not pay for them.  The ASGI service calls it during lifespan startup
+and the Streamlit page starts it on a background thread on its first script
+run.
+
+``python -m unitconvert.coldstart`` measures the modules the page imports at
+startup with ``python -X importtime`` and exits with status 1 if they take
+longer than the budget or pull in a heavy module such as pandas.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Modules UnitC.py imports before the first page render
+APP_MODULES = (
+    "unitconvert",
+    "unitconvert.coldstart",
+    "unitconvert.expression",
+    "unitconvert.history",
+    "unitconvert.metrics",
+    "unitconvert.reference",
+    "unitconvert.search",
+)
+
+# Modules that must only be imported when a feature needs them
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy")
+
+IMPORT_BUDGET_MS = float(os.environ.get("UNICONVERT_IMPORT_BUDGET_MS", 100))
+
+# Queries compiled during warm-up so the first searches hit the plan cache
+WARMUP_EXPRESSIONS = ("1 m to ft", "1 kg to lb", "100 c to f", "1 l to gal", "1 kwh to kj")
+
+
+def _build_search_index():
+    from .search import default_index
+    default_index()
+
+
+def _build_dimensions():
+    from .dimensions import parse_unit
+    parse_unit("kWh/km")
+
+
+def _compile_expressions():
+    from .expression import compile_expression
+    for text in WARMUP_EXPRESSIONS:
+        compile_expression(text)
+
+
+def _render_reference_tables():
+    from .reference import reference_markdown
+    from .registry import CATEGORIES
+    for category in CATEGORIES:
+        reference_markdown(category)
+
+
+def _build_factor_matrices():
+    from . import batch  # noqa: F401  (builds MATRICES on import)
+
+
+def warmup(batch=True):
+    """Build lazily constructed tables now; return ``{step: seconds}``.
+
+    ``batch=False`` skips the NumPy factor matrices, for processes that never
+    convert arrays.
+    """
+    steps = {
+        "search index": _build_search_index,
+        "dimensions": _build_dimensions,
+        "expressions": _compile_expressions,
+        "reference tables": _render_reference_tables,
+    }
+    if batch:
+        steps["factor matrices"] = _build_factor_matrices
+    timings = {}
+    for name, step in steps.items():
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def _importtime(code):
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True).stderr
+
+
+def measure_imports(modules=APP_MODULES):
+    """Import ``modules`` in a fresh interpreter under ``-X importtime``.
+
+    Returns ``(total seconds, {module: (self seconds, cumulative seconds)})``
+    covering only what the modules add to interpreter startup.
+    """
+    startup = {line.rsplit("|", 1)[-1] for line in _importtime("pass").splitlines()}
+    roots = {module.rsplit(".", i)[0] for module in modules for i in range(module.count(".") + 1)}
+    timings = {}
+    total = 0
+    for line in _importtime("import " + ", ".join(modules)).splitlines():
+        if not line.startswith("import time:") or "|" not in line or line.rsplit("|", 1)[-1] in startup:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # header
+        module = name.strip()
+        timings[module] = (int(own) / 1e6, int(cumulative) / 1e6)
+        if name == " " + module and module in roots:
+            total += int(cumulative)  # top-level entry, already includes its imports
+    return total / 1e6, timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m unitconvert.coldstart",
+                                     description="Check the app's startup imports against a time budget.")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help="allowed import time in milliseconds (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list (default: %(default)s)")
+    parser.add_argument("--warmup", action="store_true", help="also time each warm-up step")
+    args = parser.parse_args(argv)
+
+    total, timings = measure_imports()
+    print(f"startup imports: {total * 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for module, (own, _) in sorted(timings.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {own * 1000:8.2f} ms  {module}")
+    heavy = [module for module in HEAVY_MODULES if module in timings]
+    if heavy:
+        print(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if args.warmup:
+        for step, seconds in warmup().items():
+            print(f"warm-up {step:<18} {seconds * 1000:8.2f} ms")
+    return 1 if heavy or total * 1000 > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Numerical consistency checks for the conversion tables.
+
+``python -m unitconvert.consistency`` is a fast gate for performance work:
+it exits with status 1 if any check fails.  It prints the random seed it
+used; pass it back with ``--seed`` to reproduce a failure.  ``pytest``
+runs the same checks with fixed seeds (``tests/test_consistency.py``).
+
+* Anchors: known facts (1 kWh = 3.6 MJ, 1 KiB = 1024 B, ...) hold exactly,
+  so no category can silently use inverted factors.
+* Exact algebra: for every pair of units the exact factors invert each other
+  and compose (``a -> b -> c`` equals ``a -> c``).
+* Derived units: units named after others (``mile per hour``,
+  ``square foot``, ``kilowatt hour``) agree with dimensional analysis.
+* Float accuracy: millions of random values per category, with random unit
+  pairs, go through the vectorized path and are compared with an extended
+  precision reference built from the exact factors, plus a sample checked
+  against exact Fractions.
+* Round trips: ``a -> b -> a`` returns the input within a few ulps.
+"""
+import argparse
+import re
+import secrets
+import sys
+import time
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+import numpy as np
+
+from .batch import convert_mixed
+from .engine import convert, convert_exact, exact_conversion_factor
+from .registry import AFFINE, CATEGORIES, get_category
+
+DEFAULT_SAMPLES = 1_000_000
+DEFAULT_EXACT_SAMPLES = 1000
+# Allowed error in units of float64 epsilon relative to the operands
+TOLERANCE_ULPS = 4
+
+_EPS = np.finfo(np.float64).eps
+_EXTENDED = np.finfo(np.longdouble).eps < _EPS
+
+# Facts the tables must reproduce exactly: (category, value, from, to, expected)
+ANCHORS = (
+    ("length", 1, "kilometer", "meter", 1000),
+    ("length", 1, "foot", "inch", 12),
+    ("weight", 1, "kilogram", "gram", 1000),
+    ("weight", 1, "pound", "ounce", 16),
+    ("temperature", 100, "celsius", "fahrenheit", 212),
+    ("temperature", 0, "celsius", "kelvin", Fraction('273.15')),
+    ("volume", 1, "cubic meter", "liter", 1000),
+    ("volume", 1, "gallon (US)", "pint (US)", 8),
+    ("time", 1, "hour", "second", 3600),
+    ("data", 1, "kilobyte", "byte", 1000),
+    ("data", 1, "kibibyte", "byte", 1024),
+    ("data", 1, "gigabyte", "megabyte", 1000),
+    ("data", 1, "gibibyte", "mebibyte", 1024),
+    ("data", 1, "byte", "bit", 8),
+    ("area", 1, "hectare", "square meter", 10000),
+    ("speed", 36, "kilometer per hour", "meter per second", 10),
+    ("energy", 1, "kilowatt hour", "joule", 3600000),
+    ("energy", 1, "kilocalorie", "calorie", 1000),
+    ("pressure", 1, "bar", "pascal", 100000),
+    ("pressure", 1, "atmosphere", "torr", 760),
+    ("power", 1, "kilowatt", "watt", 1000),
+    ("frequency", 1, "kilohertz", "hertz", 1000),
+    ("frequency", 60, "revolution per minute", "hertz", 1),
+)
+
+
+def check_anchors():
+    failures = []
+    for category, value, from_unit, to_unit, expected in ANCHORS:
+        result = convert_exact(category, value, from_unit, to_unit)
+        if result != expected:
+            failures.append(f"{value} {from_unit} is {result} {to_unit}, expected {expected}")
+    return failures
+
+
+def check_exact_algebra(category):
+    """Exact factors invert each other and compose for every pair and triple of units."""
+    category = get_category(category)
+    factors = {(a, b): exact_conversion_factor(category.id, a, b)
+               for a in category.units for b in category.units}
+    failures = []
+    for a in category.units:
+        for b in category.units:
+            m_ab, o_ab = factors[a, b]
+            m_ba, o_ba = factors[b, a]
+            if m_ab * m_ba != 1 or o_ab * m_ba + o_ba != 0:
+                failures.append(f"{a} -> {b} -> {a} is not the identity")
+            for c in category.units:
+                m_bc, o_bc = factors[b, c]
+                if (m_ab * m_bc, o_ab * m_bc + o_bc) != factors[a, c]:
+                    failures.append(f"{a} -> {b} -> {c} differs from {a} -> {c}")
+    return failures
+
+
+def _derived_expression(unit):
+    unit = re.sub(r"\s*\(.*?\)", "", unit)
+    if " per " in unit:
+        return unit.replace(" per ", "/")
+    for prefix, exponent in (("square ", 2), ("cubic ", 3)):
+        if unit.startswith(prefix):
+            return f"{unit[len(prefix):]}^{exponent}"
+    words = unit.split()
+    if len(words) == 2:
+        return "*".join(words)
+    return None
+
+
+def check_derived_units(category):
+    """Units named after other units match their dimensional-analysis factor."""
+    from .dimensions import exact_compound_factor
+
+    category = get_category(category)
+    failures = []
+    if category.kind == AFFINE:
+        return failures
+    for unit in category.units:
+        expression = _derived_expression(unit)
+        if expression is None:
+            continue
+        try:
+            factor = exact_compound_factor(unit, expression)
+        except ValueError:
+            continue  # built from a unit the registry does not define
+        if factor != 1:
+            failures.append(f"1 {unit} is {float(factor):.12g} {expression}")
+    return failures
+
+
+def random_values(rng, size):
+    """Signed values spread log-uniformly over 1e-30 .. 1e30, plus edge cases."""
+    values = rng.choice([-1.0, 1.0], size) * 10.0 ** rng.uniform(-30, 30, size)
+    specials = np.array([0.0, 1.0, -1.0, 0.1, -40.0, 273.15, -459.67, 1e30, -1e-30])
+    values[:len(specials)] = specials[:size]
+    return values
+
+
+def _longdouble(fraction):
+    with localcontext() as context:
+        context.prec = 40
+        return np.longdouble(str(Decimal(fraction.numerator) / Decimal(fraction.denominator)))
+
+
+def _exact_matrices(category):
+    size = len(category.units)
+    multipliers = np.empty((size, size), dtype=np.longdouble)
+    offsets = np.empty((size, size), dtype=np.longdouble)
+    for i, from_unit in enumerate(category.units):
+        for j, to_unit in enumerate(category.units):
+            multiplier, offset = exact_conversion_factor(category.id, from_unit, to_unit)
+            multipliers[i, j], offsets[i, j] = _longdouble(multiplier), _longdouble(offset)
+    return multipliers, offsets
+
+
+def check_float_accuracy(category, samples=DEFAULT_SAMPLES, exact_samples=DEFAULT_EXACT_SAMPLES, rng=None):
+    """Vectorized float results agree with the exact factors within the tolerance."""
+    category = get_category(category)
+    rng = np.random.default_rng() if rng is None else rng
+    failures = []
+    size = len(category.units)
+
+    if _EXTENDED and samples:
+        values = random_values(rng, samples)
+        from_index = rng.integers(0, size, samples)
+        to_index = rng.integers(0, size, samples)
+        result = convert_mixed(category.id, values, from_index, to_index)
+        multipliers, offsets = _exact_matrices(category)
+        scaled = values.astype(np.longdouble) * multipliers[from_index, to_index]
+        offset = offsets[from_index, to_index]
+        error = np.abs(result.astype(np.longdouble) - (scaled + offset))
+        bound = TOLERANCE_ULPS * _EPS * (np.abs(scaled) + np.abs(offset))
+        bad = np.flatnonzero(error > bound)
+        if bad.size:
+            i = bad[0]
+            failures.append(
+                f"{bad.size} of {samples} results off, e.g. {values[i]!r} "
+                f"{category.units[from_index[i]]} -> {category.units[to_index[i]]} gave {result[i]!r}"
+            )
+
+    for value in random_values(rng, exact_samples).tolist():
+        from_unit, to_unit = rng.choice(category.units, 2).tolist()
+        multiplier, offset = exact_conversion_factor(category.id, from_unit, to_unit)
+        scaled = Fraction(value) * multiplier
+        result = convert(category.id, value, from_unit, to_unit)
+        bound = TOLERANCE_ULPS * Fraction(_EPS) * (abs(scaled) + abs(offset))
+        if abs(Fraction(result) - (scaled + offset)) > bound:
+            failures.append(f"{value!r} {from_unit} -> {to_unit} gave {result!r}, "
+                            f"exactly {float(scaled + offset)!r}")
+    return failures
+
+
+def check_round_trips(category, samples=DEFAULT_SAMPLES, rng=None):
+    """``a -> b -> a`` through the vectorized path returns each value within the tolerance."""
+    category = get_category(category)
+    rng = np.random.default_rng() if rng is None else rng
+    size = len(category.units)
+    values = random_values(rng, samples)
+    from_index = rng.integers(0, size, samples)
+    to_index = rng.integers(0, size, samples)
+    there = convert_mixed(category.id, values, from_index, to_index)
+    back = convert_mixed(category.id, there, to_index, from_index)
+
+    multipliers = np.array([[float(exact_conversion_factor(category.id, a, b)[0]) for b in category.units]
+                            for a in category.units])
+    offsets = np.array([[float(exact_conversion_factor(category.id, a, b)[1]) for b in category.units]
+                        for a in category.units])
+    bound = TOLERANCE_ULPS * _EPS * (
+        np.abs(values)
+        + np.abs(offsets[from_index, to_index] * multipliers[to_index, from_index])
+        + np.abs(offsets[to_index, from_index])
+    )
+    bad = np.flatnonzero(np.abs(back - values) > bound)
+    if not bad.size:
+        return []
+    i = bad[0]
+    return [f"{bad.size} of {samples} round trips off, e.g. {values[i]!r} "
+            f"{category.units[from_index[i]]} -> {category.units[to_index[i]]} -> back gave {back[i]!r}"]
+
+
+def run(categories=None, samples=DEFAULT_SAMPLES, seed=None):
+    """Run every check and return ``{check name: [failure, ...]}``."""
+    rng = np.random.default_rng(seed)
+    categories = list(CATEGORIES) if categories is None else [get_category(c).id for c in categories]
+    results = {"anchors": check_anchors()}
+    for category in categories:
+        results[f"{category}: exact algebra"] = check_exact_algebra(category)
+        results[f"{category}: derived units"] = check_derived_units(category)
+        results[f"{category}: float accuracy"] = check_float_accuracy(category, samples, rng=rng)
+        results[f"{category}: round trips"] = check_round_trips(category, samples, rng=rng)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m unitconvert.consistency",
+                                     description="Check the conversion tables for numerical consistency.")
+    parser.add_argument("categories", nargs="*", help="categories to check (default: all)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES,
+                        help="random values per category and check (default: %(default)s)")
+    parser.add_argument("--seed", type=int, help="random seed, for reproducing a failure (default: random)")
+    args = parser.parse_args(argv)
+    try:
+        categories = [get_category(c).id for c in args.categories] or None
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    seed = secrets.randbits(32) if args.seed is None else args.seed
+    print(f"seed {seed}")
+    start = time.perf_counter()
+    results = run(categories, args.samples, seed)
+    failed = 0
+    for name, failures in results.items():
+        failed += bool(failures)
+        print(f"{name:<32} {'FAIL' if failures else 'ok'}")
+        for failure in failures[:5]:
+            print(f"    {failure}")
+    if not _EXTENDED:
+        print("note: no extended precision on this platform; floats were checked on the exact sample only")
+    print(f"{len(results) - failed}/{len(results)} checks passed in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
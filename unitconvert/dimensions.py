@@ -0,0 +1,244 @@
+"""Dimensional analysis for compound units such as ``kWh/km`` or ``N·m``.
+
+Every unit is reduced to a scale in coherent SI units and a dimension: the
+exponents of the base dimensions in :data:`BASE_DIMENSIONS`, held in a small
+fixed-size ``int8`` array.  Multiplying units adds their exponents, dividing
+subtracts them, so any product or quotient of known units converts to any
+other with the same dimension without a hand-written table.  Parsed
+compound units are cached by their text.
+
+Unit expressions are factors joined by ``*``, ``·`` or ``/`` with optional
+exponents (``m^2``, ``s²``, ``s-1``) and numeric multipliers (``kWh/100km``).
+Everything after the first ``/`` is in the denominator, so ``J/kg·K`` means
+joules per kilogram-kelvin.  Symbols are case-sensitive (``kN`` is a
+kilonewton, ``kn`` a knot) and two symbols may be written together
+(``Nm``); names and lowercase symbols such as ``kwh`` match in any case.
+"""
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from .registry import AFFINE, CATEGORIES
+from .search import _compatible, default_index
+
+# Byte is not SI, but data sizes need a dimension of their own
+BASE_DIMENSIONS = ("m", "kg", "s", "A", "K", "mol", "cd", "B")
+
+# Number of parsed compound units kept, least recently used evicted first
+CACHE_SIZE = 4096
+
+
+def dimension(**exponents):
+    """Dimension vector from base exponents, e.g. ``dimension(m=1, s=-1)``."""
+    vector = np.zeros(len(BASE_DIMENSIONS), dtype=np.int8)
+    for base, exponent in exponents.items():
+        vector[BASE_DIMENSIONS.index(base)] = exponent
+    vector.flags.writeable = False
+    return vector
+
+
+DIMENSIONLESS = dimension()
+
+# Dimension of each category and the size of its base unit in SI units
+CATEGORY_DIMENSIONS = {
+    "length": (dimension(m=1), Fraction(1)),
+    "weight": (dimension(kg=1), Fraction(1)),
+    "temperature": (dimension(K=1), Fraction(1)),
+    "volume": (dimension(m=3), Fraction(1, 1000)),
+    "time": (dimension(s=1), Fraction(1)),
+    "data": (dimension(B=1), Fraction(1)),
+    "area": (dimension(m=2), Fraction(1)),
+    "speed": (dimension(m=1, s=-1), Fraction(1)),
+    "energy": (dimension(kg=1, m=2, s=-2), Fraction(1)),
+    "pressure": (dimension(kg=1, m=-1, s=-2), Fraction(1)),
+    "power": (dimension(kg=1, m=2, s=-3), Fraction(1)),
+    "frequency": (dimension(s=-1), Fraction(1)),
+}
+
+# Named SI units that have no category of their own: (symbol, aliases, dimension)
+DERIVED_UNITS = {
+    "newton": ("N", ("newtons",), dimension(kg=1, m=1, s=-2)),
+    "ampere": ("A", ("amp", "amps", "amperes"), dimension(A=1)),
+    "coulomb": ("C", ("coulombs",), dimension(A=1, s=1)),
+    "volt": ("V", ("volts",), dimension(kg=1, m=2, s=-3, A=-1)),
+    "ohm": ("Ω", ("ohms",), dimension(kg=1, m=2, s=-3, A=-2)),
+    "mole": ("mol", ("moles",), dimension(mol=1)),
+    "candela": ("cd", (), dimension(cd=1)),
+}
+
+# Prefixes applied to the derived units' names and symbols ("kN", "kilonewton")
+SI_PREFIXES = {
+    "milli": ("m", Fraction(1, 1000)),
+    "kilo": ("k", Fraction(1000)),
+    "mega": ("M", Fraction(1000000)),
+}
+
+_SUPERSCRIPTS = str.maketrans("⁻⁰¹²³⁴⁵⁶⁷⁸⁹", "-0123456789")
+_FACTOR = re.compile(r"(?P<name>.*?[^\d^⁻⁰¹²³⁴⁵⁶⁷⁸⁹-])\^?(?P<exponent>-?\d+|[⁻⁰¹²³⁴⁵⁶⁷⁸⁹]+)?")
+_NUMBER = re.compile(r"(?P<number>\d+(?:\.\d*)?|\.\d+)(?P<rest>.*)")
+_SEPARATORS = re.compile(r"\s*([*·⋅/])\s*")
+
+
+class CompoundUnit(NamedTuple):
+    text: str
+    scale: Fraction  # size of one unit in coherent SI units
+    dimension: np.ndarray
+
+
+def format_dimension(vector):
+    """Render a dimension vector as e.g. ``m²·kg·s⁻²``."""
+    superscripts = str.maketrans("-0123456789", "⁻⁰¹²³⁴⁵⁶⁷⁸⁹")
+    parts = [base if exponent == 1 else base + str(int(exponent)).translate(superscripts)
+             for base, exponent in zip(BASE_DIMENSIONS, vector) if exponent]
+    return "·".join(parts) or "1"
+
+
+_CATEGORY_BY_DIMENSION = {
+    vector.tobytes(): category_id for category_id, (vector, _) in CATEGORY_DIMENSIONS.items()
+}
+
+
+def category_for(vector):
+    """Id of the category measuring ``vector``, or None."""
+    key = np.asarray(vector, dtype=np.int8).tobytes()
+    if key in _CATEGORY_BY_DIMENSION:
+        return _CATEGORY_BY_DIMENSION[key]
+    for category in CATEGORIES.values():
+        if category.dimension and dimension(**category.dimension).tobytes() == key:
+            return category.id
+    return None
+
+
+def _category_dimension(category):
+    if category.id in CATEGORY_DIMENSIONS:
+        return CATEGORY_DIMENSIONS[category.id]
+    if category.dimension:  # plugin category, sized in coherent SI units
+        return dimension(**category.dimension), Fraction(1)
+    return None
+
+
+def _measure(category_id, unit):
+    category = CATEGORIES[category_id]
+    measure = _category_dimension(category)
+    if measure is None:
+        return None  # no known dimension
+    if category.kind == AFFINE:  # offset scales cannot be multiplied
+        return (measure[0], Fraction(1)) if unit == "kelvin" else None
+    vector, base_scale = measure
+    return vector, category.factors[unit] * base_scale
+
+
+@lru_cache(maxsize=None)
+def _atoms():
+    """``(symbols, names)``: cased symbols and lowercase names to ``(dimension, scale)``."""
+    symbols, names = {}, {}
+    for name, (symbol, aliases, vector) in DERIVED_UNITS.items():
+        symbols[symbol] = (vector, Fraction(1))
+        for term in (name, *aliases):
+            names[term] = (vector, Fraction(1))
+        for prefix, (prefix_symbol, factor) in SI_PREFIXES.items():
+            symbols.setdefault(prefix_symbol + symbol, (vector, factor))
+            names[prefix + name] = (vector, factor)
+    for term, targets in default_index().items():
+        for category_id, unit, symbol in targets:
+            measure = _measure(category_id, unit)
+            if measure is None:
+                continue
+            if symbol is None:
+                names.setdefault(term, measure)
+            else:
+                symbols[symbol] = measure  # registry symbols win over prefixed forms
+    return symbols, names
+
+
+def _atom(text):
+    """``(dimension, scale)`` of a single unit, or None."""
+    symbols, names = _atoms()
+    if text in symbols:
+        return symbols[text]
+    folded = text.lower()
+    if folded in names:
+        return names[folded]
+    for symbol, measure in symbols.items():
+        if symbol.lower() == folded and _compatible(text, symbol):
+            return measure
+    prefixes = {prefix_symbol for prefix_symbol, _ in SI_PREFIXES.values()}
+    for i in range(1, len(text)):  # symbols written together: "Nm", "kNm", but not "mW"
+        if text[:i] in symbols and text[i:] in symbols and text[:i] not in prefixes:
+            (left, left_scale), (right, right_scale) = symbols[text[:i]], symbols[text[i:]]
+            return left + right, left_scale * right_scale
+    return None
+
+
+def _factor(text):
+    atom = _atom(text)
+    if atom is not None:
+        return atom
+    number = _NUMBER.fullmatch(text)
+    if number:  # "1/s", "kWh/100km"
+        vector, scale = _factor(number["rest"]) if number["rest"] else (DIMENSIONLESS, 1)
+        return vector, Fraction(number["number"]) * scale
+    parsed = _FACTOR.fullmatch(text)
+    atom = _atom(parsed["name"]) if parsed and parsed["exponent"] else None
+    if atom is not None:
+        vector, scale = atom
+        exponent = int(parsed["exponent"].translate(_SUPERSCRIPTS))
+        return vector * exponent, scale ** exponent
+    raise ValueError(f"Unknown unit {text!r}")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_unit(text):
+    """Resolve a unit expression to a :class:`CompoundUnit`."""
+    cleaned = " ".join(text.split())
+    atom = _atom(cleaned)
+    if atom is not None:
+        vector, scale = atom
+        return CompoundUnit(text, scale, vector)
+    vector = DIMENSIONLESS.copy()
+    scale = Fraction(1)
+    sign = 1
+    pieces = _SEPARATORS.split(cleaned)
+    if not pieces[0] or len(pieces) % 2 == 0:
+        raise ValueError(f"Malformed unit expression {text!r}")
+    for i, piece in enumerate(pieces):
+        if i % 2:
+            sign = -1 if piece == "/" or sign == -1 else 1
+            continue
+        factor_vector, factor_scale = _factor(piece)
+        vector += sign * factor_vector
+        scale *= factor_scale ** sign
+    vector.flags.writeable = False
+    return CompoundUnit(text, scale, vector)
+
+
+def exact_compound_factor(from_unit, to_unit):
+    """Exact multiplier from one unit expression to another of the same dimension."""
+    source, target = parse_unit(from_unit), parse_unit(to_unit)
+    if not np.array_equal(source.dimension, target.dimension):
+        raise ValueError(
+            f"Cannot convert {from_unit!r} ({format_dimension(source.dimension)}) "
+            f"to {to_unit!r} ({format_dimension(target.dimension)})"
+        )
+    return source.scale / target.scale
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compound_factor(from_unit, to_unit):
+    """Float multiplier from one unit expression to another of the same dimension."""
+    return float(exact_compound_factor(from_unit, to_unit))
+
+
+def convert_compound(value, from_unit, to_unit):
+    """Convert ``value`` between two unit expressions, e.g. ``"kWh/100km"`` to ``"J/m"``."""
+    return value * compound_factor(from_unit, to_unit)
+
+
+def invalidate():
+    """Forget resolved units after the registry changed."""
+    _atoms.cache_clear()
+    parse_unit.cache_clear()
+    compound_factor.cache_clear()
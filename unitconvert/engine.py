@@ -0,0 +1,151 @@
+"""Scalar conversion engine.
+
+Every ``from -> to`` pair of every built-in category is compiled once at
+import into an exact ``(multiplier, offset)`` pair of Fractions, and the
+float pair used by the fast path is derived from it; pairs of units added
+later by plugins are compiled the same way on first use.  A conversion is a
+dict lookup plus ``value * multiplier + offset``.
+"""
+from decimal import Decimal
+from fractions import Fraction
+
+from .registry import AFFINE, CATEGORIES, get_category
+
+# Human-readable formulas for the affine (temperature) pairs
+_TEMPERATURE_FORMULAS = {
+    ('celsius', 'fahrenheit'): "({value} × 9/5) + 32",
+    ('fahrenheit', 'celsius'): "({value} - 32) × 5/9",
+    ('celsius', 'kelvin'): "{value} + 273.15",
+    ('kelvin', 'celsius'): "{value} - 273.15",
+    ('fahrenheit', 'kelvin'): "({value} - 32) × 5/9 + 273.15",
+    ('kelvin', 'fahrenheit'): "({value} - 273.15) × 9/5 + 32",
+}
+
+
+def _pair(category, from_unit, to_unit):
+    factors = category.factors
+    if category.kind == AFFINE:
+        from_scale, from_offset = factors[from_unit]
+        to_scale, to_offset = factors[to_unit]
+        return from_scale / to_scale, (from_offset - to_offset) / to_scale
+    return factors[from_unit] / factors[to_unit], Fraction(0)
+
+
+def _compile(category):
+    return {(from_unit, to_unit): _pair(category, from_unit, to_unit)
+            for from_unit in category.units for to_unit in category.units}
+
+
+_EXACT_PAIRS = {category_id: _compile(category) for category_id, category in CATEGORIES.items()}
+_PAIRS = {
+    category_id: {pair: (float(multiplier), float(offset)) for pair, (multiplier, offset) in pairs.items()}
+    for category_id, pairs in _EXACT_PAIRS.items()
+}
+
+
+def _lookup(table, category, from_unit, to_unit):
+    try:
+        return table[category][from_unit, to_unit]
+    except KeyError:
+        category = get_category(category)
+        try:
+            return table[category.id][from_unit, to_unit]
+        except KeyError:
+            pass
+        # Categories registered after import (plugins) are compiled pair by
+        # pair on first use, so thousands of units cost nothing up front
+        if from_unit not in category.factors or to_unit not in category.factors:
+            raise ValueError(
+                f"Cannot convert {from_unit!r} to {to_unit!r} in {category.name}"
+            ) from None
+        multiplier, offset = _pair(category, from_unit, to_unit)
+        _EXACT_PAIRS.setdefault(category.id, {})[from_unit, to_unit] = (multiplier, offset)
+        _PAIRS.setdefault(category.id, {})[from_unit, to_unit] = (float(multiplier), float(offset))
+        return table[category.id][from_unit, to_unit]
+
+
+def invalidate(category_id):
+    """Forget compiled pairs of a category whose units changed."""
+    _EXACT_PAIRS.pop(category_id, None)
+    _PAIRS.pop(category_id, None)
+
+
+def conversion_factor(category, from_unit, to_unit):
+    """Return the precomputed float ``(multiplier, offset)`` for a unit pair."""
+    return _lookup(_PAIRS, category, from_unit, to_unit)
+
+
+def exact_conversion_factor(category, from_unit, to_unit):
+    """Return the exact ``(multiplier, offset)`` Fractions for a unit pair."""
+    return _lookup(_EXACT_PAIRS, category, from_unit, to_unit)
+
+
+def convert(category, value, from_unit, to_unit):
+    """Convert a single value between two units of the same category."""
+    multiplier, offset = conversion_factor(category, from_unit, to_unit)
+    return value * multiplier + offset
+
+
+def convert_exact(category, value, from_unit, to_unit):
+    """Convert without rounding using the exact factor table.
+
+    Floats are read as the decimal they print as (``0.1`` means 1/10).  A
+    :class:`~decimal.Decimal` value gives a Decimal result rounded to the
+    current decimal context; anything else gives a Fraction.
+    """
+    multiplier, offset = exact_conversion_factor(category, from_unit, to_unit)
+    exact = Fraction(repr(value)) if isinstance(value, float) else Fraction(value)
+    result = exact * multiplier + offset
+    if isinstance(value, Decimal):
+        return Decimal(result.numerator) / Decimal(result.denominator)
+    return result
+
+
+class Conversion:
+    """Result of a single conversion whose formula is rendered on first use."""
+
+    __slots__ = ("category", "value", "from_unit", "to_unit", "result", "_formula")
+
+    def __init__(self, category, value, from_unit, to_unit, result):
+        self.category = category
+        self.value = value
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.result = result
+        self._formula = None
+
+    @property
+    def formula(self):
+        if self._formula is None:
+            self._formula = formula(self.category, self.value, self.from_unit, self.to_unit)
+        return self._formula
+
+    def __float__(self):
+        return float(self.result)
+
+    def __repr__(self):
+        return (f"Conversion({self.category!r}, {self.value!r}, {self.from_unit!r}, "
+                f"{self.to_unit!r}, result={self.result!r})")
+
+
+def conversion(category, value, from_unit, to_unit):
+    """Convert a value and return a :class:`Conversion` with a lazy formula."""
+    return Conversion(category, value, from_unit, to_unit, convert(category, value, from_unit, to_unit))
+
+
+def formula(category, value, from_unit, to_unit):
+    """Render the formula shown next to a conversion result."""
+    category = get_category(category)
+    if category.kind == AFFINE:
+        template = _TEMPERATURE_FORMULAS.get((from_unit, to_unit))
+        if template is not None:
+            return template.format(value=value)
+        if from_unit == to_unit:
+            return "No conversion needed"
+        multiplier, offset = conversion_factor(category.id, from_unit, to_unit)  # plugin units
+        scaled = str(value) if multiplier == 1 else f"{value} × {multiplier:.12g}"
+        if offset == 0:
+            return scaled
+        return f"{scaled} {'-' if offset < 0 else '+'} {abs(offset):.12g}"
+    factors = category.factors
+    return f"{value} {from_unit} × ({float(factors[from_unit]):.12g}/{float(factors[to_unit]):.12g})"
@@ -0,0 +1,134 @@
+"""Free-text conversion expressions such as ``"3 ft 4 in to cm"``.
+
+An expression is one or more quantities (a number followed by a unit name or
+alias) and a target unit after ``to``, ``in``, ``into`` or ``as``.
+:func:`compile_expression` parses it once into a :class:`Plan` holding the
+float factors from the engine's pair table; plans are cached by expression
+string, so repeated queries skip tokenizing and unit lookup entirely.
+
+Expressions whose units are not in any category, such as
+``"15 kWh/100km to J/m"``, are converted by dimensional analysis (see
+:mod:`unitconvert.dimensions`); their plans have no category.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+from .engine import conversion_factor
+from .registry import AFFINE, CATEGORIES
+from .search import default_index
+
+# Number of compiled expressions kept, least recently used evicted first
+CACHE_SIZE = 1024
+
+_KEYWORDS = {"to", "in", "into", "as", "->", "→"}
+_NUMBER = re.compile(r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class Plan(NamedTuple):
+    category: object  # category id, or None for compound units
+    quantities: tuple  # ((value, unit), ...) as written
+    to_unit: str
+    factors: tuple  # ((multiplier, offset), ...) per quantity
+    result: float
+
+    def apply(self, *values):
+        """Evaluate the plan with new magnitudes for its quantities, in order."""
+        if len(values) != len(self.factors):
+            raise ValueError(f"Expected {len(self.factors)} values, got {len(values)}")
+        return sum(value * multiplier + offset
+                   for value, (multiplier, offset) in zip(values, self.factors))
+
+
+def _tokenize(text):
+    tokens = []
+    for chunk in text.split():
+        number = _NUMBER.match(chunk)
+        if number and number.end() < len(chunk) and not chunk[number.end()].isdigit():
+            tokens += [number.group(), chunk[number.end():]]  # "5ft", "4\""
+        else:
+            tokens.append(chunk)
+    return tokens
+
+
+def _is_number(token):
+    return _NUMBER.fullmatch(token) is not None
+
+
+def _unit(words):
+    matches = default_index().lookup(" ".join(words)) if words else []
+    return {category: unit for category, unit in reversed(matches)}
+
+
+def _quantities(tokens):
+    quantities = []
+    i = 0
+    while i < len(tokens):
+        if not _is_number(tokens[i]):
+            return None
+        j = i + 1
+        while j < len(tokens) and not _is_number(tokens[j]):
+            j += 1
+        units = _unit(tokens[i + 1:j])
+        if not units:
+            return None
+        quantities.append((float(tokens[i]), units))
+        i = j
+    return quantities or None
+
+
+def _split(tokens):
+    # The target is everything after the last keyword that leaves two valid
+    # halves, so "3 ft 4 in to cm" and "60 mph in m/s" both parse
+    for k in range(len(tokens) - 2, 0, -1):
+        if tokens[k].lower() not in _KEYWORDS:
+            continue
+        target = _unit(tokens[k + 1:])
+        quantities = _quantities(tokens[:k])
+        if target and quantities:
+            return quantities, target
+    raise ValueError("Expected '<value> <unit> [<value> <unit> ...] to <unit>'")
+
+
+def _compound(tokens):
+    from .dimensions import compound_factor
+
+    value, from_unit, keyword, to_unit = tokens
+    multiplier = compound_factor(from_unit, to_unit)
+    return Plan(None, ((float(value), from_unit),), to_unit, ((multiplier, 0.0),),
+                float(value) * multiplier)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text):
+    """Parse ``text`` into a :class:`Plan`; raises ValueError if it cannot."""
+    tokens = _tokenize(text)
+    try:
+        quantities, target = _split(tokens)
+    except ValueError:
+        if len(tokens) == 4 and _is_number(tokens[0]) and tokens[2].lower() in _KEYWORDS:
+            return _compound(tokens)
+        raise
+    shared = set(target).intersection(*(units for _, units in quantities))
+    category = next((category for category in CATEGORIES if category in shared), None)
+    if category is None:
+        raise ValueError(f"Units in {text!r} do not belong to one category")
+    if CATEGORIES[category].kind == AFFINE and len(quantities) > 1:
+        raise ValueError(f"Cannot add quantities of {CATEGORIES[category].name}")
+
+    to_unit = target[category]
+    quantities = tuple((value, units[category]) for value, units in quantities)
+    factors = tuple(conversion_factor(category, unit, to_unit) for _, unit in quantities)
+    result = sum(value * multiplier + offset
+                 for (value, _), (multiplier, offset) in zip(quantities, factors))
+    return Plan(category, quantities, to_unit, factors, result)
+
+
+def evaluate(text):
+    """Result of a conversion expression as a float in its target unit."""
+    return compile_expression(text).result
+
+
+def invalidate():
+    """Forget compiled plans after the registry changed."""
+    compile_expression.cache_clear()
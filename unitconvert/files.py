@@ -0,0 +1,74 @@
+"""Chunked conversion of CSV and Parquet files.
+
+Files are read and written a chunk at a time so that large uploads are never
+held in memory as a single DataFrame.
+"""
+import time
+
+import pandas as pd
+
+from .batch import convert_array
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def detect_format(filename):
+    """Guess the file format ("csv" or "parquet") from a file name."""
+    return "parquet" if filename.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def read_columns(source, fmt):
+    """Return the column names of a file without reading its rows."""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return list(pq.ParquetFile(source).schema_arrow.names)
+    return list(pd.read_csv(source, nrows=0).columns)
+
+
+def iter_chunks(source, fmt, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the rows of ``source`` as DataFrames of at most ``chunksize`` rows."""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
+
+
+def convert_chunk(chunk, category, columns, to_unit):
+    """Convert the ``{column: from_unit}`` columns of a DataFrame in place."""
+    for column, from_unit in columns.items():
+        chunk[column] = convert_array(category, chunk[column].to_numpy(), from_unit, to_unit)
+    return chunk
+
+
+def convert_file(source, destination, category, columns, to_unit, fmt="csv",
+                 chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Stream ``source`` into ``destination`` with ``columns`` converted.
+
+    ``destination`` is a binary file object and is written in the same
+    format as the source.  ``progress(rows, elapsed_seconds)`` is called
+    after every chunk.  Returns the total number of rows written.
+    """
+    rows = 0
+    writer = None
+    start = time.perf_counter()
+    try:
+        for chunk in iter_chunks(source, fmt, chunksize):
+            convert_chunk(chunk, category, columns, to_unit)
+            if fmt == "parquet":
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(destination, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            else:
+                destination.write(chunk.to_csv(index=False, header=rows == 0).encode())
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows, time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
@@ -0,0 +1,187 @@
+"""Bounded, compact conversion history.
+
+Records are kept in a ring buffer of typed arrays (two doubles for value and
+result, one for the timestamp and three small integers for the category and
+unit ids), about 30 bytes per entry, so thousands of entries per user cost
+very little memory.  A store can optionally persist to a local SQLite file;
+new records are written in batches rather than one transaction each, once a
+batch fills or its oldest record is ``flush_seconds`` old, and every open
+store is flushed when the interpreter exits.
+"""
+import atexit
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from array import array
+from typing import NamedTuple
+
+from .registry import CATEGORIES, get_category
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_SECONDS = 5.0
+
+# Stores with a database, flushed at exit so a restart loses no buffered rows
+_OPEN_STORES = weakref.WeakSet()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    user TEXT NOT NULL,
+    category TEXT NOT NULL,
+    from_unit TEXT NOT NULL,
+    to_unit TEXT NOT NULL,
+    value REAL NOT NULL,
+    result REAL NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_user_time ON history (user, timestamp);
+"""
+
+
+class HistoryRecord(NamedTuple):
+    category: str
+    from_unit: str
+    to_unit: str
+    value: float
+    result: float
+    timestamp: float
+
+
+class HistoryStore:
+    """Ring buffer of the most recent ``capacity`` conversions for one user."""
+
+    __slots__ = ("capacity", "user", "_categories", "_category_codes", "_unit_codes",
+                 "_category", "_from", "_to", "_value", "_result", "_timestamp",
+                 "_start", "_size", "_db", "_pending", "_batch_size", "_flush_seconds",
+                 "_lock", "__weakref__")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None, user="default",
+                 batch_size=DEFAULT_BATCH_SIZE, flush_seconds=DEFAULT_FLUSH_SECONDS):
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.capacity = capacity
+        self.user = user
+        self._categories = list(CATEGORIES.values())
+        self._category_codes = {category.id: i for i, category in enumerate(self._categories)}
+        self._unit_codes = [{unit: i for i, unit in enumerate(category.units)}
+                            for category in self._categories]
+        self._category = array('H', bytes(2 * capacity))
+        self._from = array('H', bytes(2 * capacity))
+        self._to = array('H', bytes(2 * capacity))
+        self._value = array('d', bytes(8 * capacity))
+        self._result = array('d', bytes(8 * capacity))
+        self._timestamp = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pending = []
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+            self._load()
+            _OPEN_STORES.add(self)
+
+    def _load(self):
+        rows = self._db.execute(
+            "SELECT category, from_unit, to_unit, value, result, timestamp FROM history "
+            "WHERE user = ? ORDER BY timestamp DESC LIMIT ?",
+            (self.user, self.capacity),
+        ).fetchall()
+        for row in reversed(rows):
+            try:
+                self._append(*row)
+            except (KeyError, ValueError):
+                continue  # unit no longer defined
+
+    def _append(self, category, from_unit, to_unit, value, result, timestamp):
+        code = self._category_codes[get_category(category).id]
+        units = self._unit_codes[code]
+        slot = (self._start + self._size) % self.capacity
+        self._category[slot] = code
+        self._from[slot] = units[from_unit]
+        self._to[slot] = units[to_unit]
+        self._value[slot] = value
+        self._result[slot] = result
+        self._timestamp[slot] = timestamp
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def add(self, category, from_unit, to_unit, value, result, timestamp=None):
+        """Append a conversion, evicting the oldest one when full."""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            self._append(category, from_unit, to_unit, value, result, timestamp)
+            if self._db is not None:
+                self._pending.append((self.user, get_category(category).id, from_unit, to_unit,
+                                      value, result, timestamp))
+                if (len(self._pending) >= self._batch_size
+                        or timestamp - self._pending[0][-1] >= self._flush_seconds):
+                    self._flush()
+
+    def _record(self, slot):
+        category = self._categories[self._category[slot]]
+        return HistoryRecord(category.id, category.units[self._from[slot]],
+                             category.units[self._to[slot]], self._value[slot],
+                             self._result[slot], self._timestamp[slot])
+
+    def records(self, limit=None, category=None):
+        """Return records newest first, optionally filtered by category."""
+        code = None if category is None else self._category_codes[get_category(category).id]
+        found = []
+        with self._lock:
+            for i in range(self._size - 1, -1, -1):
+                slot = (self._start + i) % self.capacity
+                if code is not None and self._category[slot] != code:
+                    continue
+                found.append(self._record(slot))
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def last(self):
+        records = self.records(limit=1)
+        return records[0] if records else None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """Bytes held by the record buffers and unwritten SQLite rows."""
+        arrays = (self._category, self._from, self._to, self._value, self._result, self._timestamp)
+        return sum(a.itemsize * len(a) for a in arrays) + sum(sys.getsizeof(row) for row in self._pending)
+
+    def __iter__(self):
+        return iter(reversed(self.records()))
+
+    def _flush(self):
+        if self._pending:
+            with self._db:
+                self._db.executemany("INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?)", self._pending)
+            self._pending.clear()
+
+    def flush(self):
+        """Write any buffered records to SQLite."""
+        if self._db is not None:
+            with self._lock:
+                self._flush()
+
+    def close(self):
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+            _OPEN_STORES.discard(self)
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_OPEN_STORES):
+        store.flush()
@@ -0,0 +1,97 @@
+"""Load-test harness for the HTTP conversion service.
+
+Start the service, then run for example::
+
+    uvicorn unitconvert.service:app --workers 4 &
+    python -m unitconvert.loadtest --batch-sizes 1,100,10000 --connections 32
+
+Each connection is a keep-alive HTTP/1.1 client sending requests back to
+back for ``--duration`` seconds; requests/sec and values/sec are reported
+for every batch size.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+
+def _payload(batch_size):
+    if batch_size == 1:
+        path = "/convert"
+        body = {"category": "length", "from": "foot", "to": "meter", "value": 12.5}
+    else:
+        path = "/convert/batch"
+        body = {"category": "length", "from": "foot", "to": "meter",
+                "values": [random.uniform(0, 1000) for _ in range(batch_size)]}
+    return path, json.dumps(body).encode()
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def _client(host, port, request, deadline, stats):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            stats["requests"] += 1
+            if status != 200:
+                stats["errors"] += 1
+    finally:
+        writer.close()
+
+
+async def run(url, batch_size, connections, duration):
+    """Hammer the service with one batch size; returns a stats dict."""
+    target = urlsplit(url)
+    host, port = target.hostname, target.port or 80
+    path, body = _payload(batch_size)
+    request = (
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n"
+    ).encode() + body
+    stats = {"requests": 0, "errors": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, request, start + duration, stats) for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    stats["requests_per_sec"] = stats["requests"] / elapsed
+    stats["values_per_sec"] = stats["requests"] * batch_size / elapsed
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m unitconvert.loadtest",
+                                     description="Load-test the unitconvert HTTP service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--batch-sizes", default="1,10,100,1000,10000",
+                        help="comma-separated values per request (1 uses /convert)")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per batch size")
+    args = parser.parse_args(argv)
+
+    print(f"{'batch':>8} {'requests/s':>12} {'values/s':>14} {'errors':>8}")
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        stats = asyncio.run(run(args.url, batch_size, args.connections, args.duration))
+        print(f"{batch_size:>8} {stats['requests_per_sec']:>12,.0f} "
+              f"{stats['values_per_sec']:>14,.0f} {stats['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
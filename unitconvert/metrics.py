@@ -0,0 +1,158 @@
+"""Lightweight latency and memory instrumentation for the app process."""
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+
+class LatencyRecorder:
+    """Thread-safe rolling window of the most recent latency samples (seconds)."""
+
+    def __init__(self, window=1000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentile(self, pct):
+        """Nearest-rank percentile of the current window, or 0.0 when empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def within_budget(self, budget_seconds, pct=99):
+        return self.percentile(pct) <= budget_seconds
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.percentile(100),
+        }
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate memory held by ``obj`` and everything it references.
+
+    Objects exposing ``nbytes`` (NumPy arrays, history stores) report that
+    instead of being walked.  Shared objects are counted once per call.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or isinstance(obj, (type, type(sys))) or callable(obj):
+        return 0
+    seen.add(id(obj))
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def process_rss():
+    """Resident set size of this process in bytes (peak RSS where unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SessionStats:
+    __slots__ = ("reruns", "total_seconds", "last_seconds", "max_seconds", "state_bytes",
+                 "last_seen", "state")
+
+    def __init__(self):
+        self.reruns = 0
+        self.total_seconds = 0.0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.state_bytes = 0
+        self.last_seen = 0.0
+        self.state = None
+
+
+class SessionTracker:
+    """Per-session rerun counts, durations and state size for the whole process."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def record_run(self, session_id, seconds, state_bytes, state=None):
+        with self._lock:
+            stats = self._sessions.get(session_id)
+            if stats is None:
+                stats = self._sessions[session_id] = SessionStats()
+            stats.reruns += 1
+            stats.total_seconds += seconds
+            stats.last_seconds = seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.state_bytes = state_bytes
+            stats.last_seen = time.time()
+            stats.state = state
+
+    def touch(self, session_id, state=None):
+        """Mark a session active without counting a full run, e.g. for a fragment rerun."""
+        with self._lock:
+            stats = self._sessions.get(session_id)
+            if stats is None:
+                stats = self._sessions[session_id] = SessionStats()
+            stats.last_seen = time.time()
+            if state is not None:
+                stats.state = state
+
+    def evict_idle(self, idle_seconds, evict):
+        """Call ``evict(state)`` for sessions idle longer than ``idle_seconds`` and forget them."""
+        cutoff = time.time() - idle_seconds
+        with self._lock:
+            idle = [(session_id, stats) for session_id, stats in self._sessions.items()
+                    if stats.last_seen < cutoff]
+            for session_id, _ in idle:
+                del self._sessions[session_id]
+        for _, stats in idle:
+            if stats.state is not None:
+                evict(stats.state)
+        return len(idle)
+
+    def snapshot(self):
+        """One row per tracked session, most recently active first."""
+        now = time.time()
+        with self._lock:
+            items = sorted(self._sessions.items(), key=lambda item: -item[1].last_seen)
+            return [
+                {
+                    "session": session_id[:8],
+                    "reruns": stats.reruns,
+                    "last ms": stats.last_seconds * 1000,
+                    "avg ms": stats.total_seconds / stats.reruns * 1000,
+                    "max ms": stats.max_seconds * 1000,
+                    "state KiB": stats.state_bytes / 1024,
+                    "idle s": now - stats.last_seen,
+                }
+                for session_id, stats in items
+            ]
+
+    def total_state_bytes(self):
+        with self._lock:
+            return sum(stats.state_bytes for stats in self._sessions.values())
+
+    def __len__(self):
+        return len(self._sessions)
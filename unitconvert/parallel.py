@@ -0,0 +1,124 @@
+"""Multi-process batch conversion over shared memory.
+
+Callers allocate their data in a :class:`SharedArray` (a NumPy array backed
+by a :mod:`multiprocessing.shared_memory` block), fill it, and each worker
+converts its slice of that block in place, or into a second shared array.
+Workers only receive block names and slice bounds, so no array data is
+pickled or copied between processes.
+
+Ordinary arrays are converted in this process: copying them into shared
+memory and back would cost more than the multiply itself.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .batch import _as_float_array
+from .engine import conversion_factor
+
+# Below this many elements per worker the process overhead outweighs the gain
+MIN_CHUNK = 1_000_000
+
+
+class SharedArray:
+    """A 1-D float array in shared memory that worker processes can convert in place.
+
+    Use it as a context manager, or call :meth:`close`, to release the block.
+    """
+
+    def __init__(self, size, dtype=np.float64):
+        dtype = np.dtype(dtype)
+        self._shm = SharedMemory(create=True, size=max(1, size * dtype.itemsize))
+        self.array = np.ndarray((size,), dtype=dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_values(cls, values, dtype=np.float64):
+        """A new shared array holding a copy of ``values``."""
+        values = np.asarray(values)
+        shared = cls(values.size, dtype)
+        shared.array[...] = values.ravel()
+        return shared
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def close(self):
+        if self.array is not None:
+            self.array = None  # release the buffer export before closing the block
+            self._shm.close()
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.array)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype, copy=False)
+
+
+def _view(shm, dtype, length, start, stop):
+    return np.ndarray((length,), dtype=dtype, buffer=shm.buf)[start:stop]
+
+
+def _convert_slice(source, target, dtype, length, start, stop, multiplier, offset):
+    blocks = [SharedMemory(name=source)]
+    if target != source:
+        blocks.append(SharedMemory(name=target))
+    try:
+        values = _view(blocks[0], dtype, length, start, stop)
+        result = _view(blocks[-1], dtype, length, start, stop)
+        np.multiply(values, multiplier, out=result)
+        if offset:
+            np.add(result, offset, out=result)
+    finally:
+        values = result = None
+        for shm in blocks:
+            shm.close()
+
+
+def convert_array_parallel(category, values, from_unit, to_unit, out=None, workers=None,
+                           executor=None):
+    """Convert a :class:`SharedArray` across worker processes.
+
+    The conversion is in place unless ``out`` is another SharedArray of the
+    same size and dtype; the converted NumPy array is returned.  ``workers``
+    defaults to the CPU count.  Pass an existing ``ProcessPoolExecutor`` as
+    ``executor`` to avoid starting a new pool per call.  Arrays too small to
+    benefit, and values not in shared memory, are converted in this process.
+    """
+    multiplier, offset = conversion_factor(category, from_unit, to_unit)
+    shared = isinstance(values, SharedArray) and (out is None or isinstance(out, SharedArray))
+    array = values.array if isinstance(values, SharedArray) else _as_float_array(values)
+    target = out if out is not None else (values if shared else None)
+    workers = workers or os.cpu_count() or 1
+    chunks = min(workers, max(1, array.size // MIN_CHUNK)) if shared else 1
+    if chunks <= 1:
+        result = np.multiply(array, multiplier, out=target.array if isinstance(target, SharedArray) else target)
+        if offset:
+            np.add(result, offset, out=result)
+        return result
+
+    if target.array.shape != array.shape or target.array.dtype != array.dtype:
+        raise ValueError("out must be a SharedArray of the same size and dtype as values")
+    bounds = np.linspace(0, array.size, chunks + 1, dtype=np.int64)
+    pool = executor or ProcessPoolExecutor(workers)
+    try:
+        futures = [
+            pool.submit(_convert_slice, values.name, target.name, array.dtype.str, array.size,
+                        int(start), int(stop), multiplier, offset)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return target.array
@@ -0,0 +1,352 @@
+"""Custom units loaded from TOML or JSON plugin files.
+
+A plugin file can add units to existing categories and define new ones::
+
+    [units.length]
+    furlong = "220 yard"          # a number, a fraction or "<number> <unit>"
+    "light year" = "9460730472580800"
+
+    [units.temperature]
+    rankine = { scale = "5/9", offset = 0 }     # affine: kelvin = value * scale + offset
+
+    [aliases.length]
+    furlong = ["fur"]
+
+    [categories.force]
+    name = "Force"
+    icon = "🪝"
+    group = "Science"
+    symbol = "N"
+    dimension = { kg = 1, m = 1, s = -2 }   # optional; base unit must then be SI
+    reference = ["newton", "kilonewton", "pound-force"]
+    units = { newton = 1, kilonewton = 1000, "pound-force" = "4.4482216152605" }
+
+JSON files use the same structure.  Parsing and validating is done once:
+:func:`load` writes the compiled definitions (exact sizes as integer
+numerator/denominator pairs) to an uncompressed ``.npz`` snapshot named
+after a hash of the files' contents, and later startups read the arrays
+back instead of re-parsing.  Set ``UNICONVERT_PLUGINS`` to plugin files or
+directories (separated by ``os.pathsep``) to load them when the package is
+imported; ``UNICONVERT_PLUGIN_CACHE`` sets the snapshot directory.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+from fractions import Fraction
+from pathlib import Path
+from typing import NamedTuple
+
+from . import engine
+from .registry import AFFINE, CATEGORIES, LINEAR, Category, get_category, register
+
+SNAPSHOT_VERSION = 1
+DEFAULT_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "unitconvert"
+
+_QUANTITY = re.compile(r"\s*(?P<number>\S+)\s+(?P<unit>.+?)\s*")
+_CATEGORY_FIELDS = ("name", "kind", "symbol", "reference", "icon", "group", "dimension")
+
+
+class PluginUnits(NamedTuple):
+    categories: dict  # id -> {field: value} for new categories
+    units: list  # [(category id, unit, size)], size a Fraction or (scale, offset)
+    aliases: list  # [(category id, unit, alias)]
+
+
+def plugin_files(paths):
+    """Expand files and directories into a sorted list of plugin files."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(p for p in path.iterdir() if p.suffix in (".toml", ".json"))
+        else:
+            files.append(path)
+    return files
+
+
+def _read(path):
+    if path.suffix == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if path.suffix == ".json":
+        with open(path) as f:
+            return json.load(f)
+    raise ValueError(f"{path}: plugin files must be .toml or .json")
+
+
+def _fraction(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"{where}: expected a number, got {value!r}")
+    try:
+        return Fraction(repr(value) if isinstance(value, float) else value)
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"{where}: {value!r} is not a number") from None
+
+
+def _size(value, sizes, where):
+    if isinstance(value, str) and not re.fullmatch(r"[\d.eE+\-/ ]+", value):
+        quantity = _QUANTITY.fullmatch(value)
+        if quantity is None or quantity["unit"] not in sizes:
+            raise ValueError(f"{where}: {value!r} is not a number or '<number> <unit>' of this category")
+        size = _fraction(quantity["number"], where) * sizes[quantity["unit"]]
+    else:
+        size = _fraction(value, where)
+    if size <= 0:
+        raise ValueError(f"{where}: unit size must be positive")
+    return size
+
+
+def _affine_size(value, where):
+    if not isinstance(value, dict) or set(value) != {"scale", "offset"}:
+        raise ValueError(f"{where}: affine units need {{scale = ..., offset = ...}}")
+    scale = _fraction(value["scale"], where)
+    if scale <= 0:
+        raise ValueError(f"{where}: scale must be positive")
+    return scale, _fraction(value["offset"], where)
+
+
+def _parse(data, path, parsed, sizes):
+    unknown = set(data) - {"units", "aliases", "categories"}
+    if unknown:
+        raise ValueError(f"{path}: unknown section(s) {', '.join(sorted(unknown))}")
+
+    for key, spec in data.get("categories", {}).items():
+        where = f"{path}: categories.{key}"
+        category_id = key.lower()
+        if category_id in CATEGORIES or category_id in parsed.categories:
+            raise ValueError(f"{where}: category already exists")
+        extra = set(spec) - set(_CATEGORY_FIELDS) - {"units"}
+        if extra:
+            raise ValueError(f"{where}: unknown field(s) {', '.join(sorted(extra))}")
+        fields = {field: spec[field] for field in _CATEGORY_FIELDS if field in spec}
+        fields.setdefault("name", key.title())
+        fields.setdefault("kind", LINEAR)
+        if fields["name"].lower() != category_id:
+            raise ValueError(f"{where}: name must match the key, got {fields['name']!r}")
+        if fields["kind"] not in (LINEAR, AFFINE):
+            raise ValueError(f"{where}: kind must be {LINEAR!r} or {AFFINE!r}")
+        if "dimension" in fields:
+            from .dimensions import BASE_DIMENSIONS
+            if not set(fields["dimension"]) <= set(BASE_DIMENSIONS):
+                raise ValueError(f"{where}: dimension bases must be among {', '.join(BASE_DIMENSIONS)}")
+        units = spec.get("units", {})
+        if not units:
+            raise ValueError(f"{where}: a category needs at least one unit")
+        parsed.categories[category_id] = fields
+        sizes[category_id] = {}
+        _parse_units(category_id, units, f"{where}.units", parsed, sizes)
+        if fields["kind"] == LINEAR and sizes[category_id][next(iter(units))] != 1:
+            raise ValueError(f"{where}: the first unit is the base unit and must have size 1")
+        missing = set(fields.get("reference", ())) - set(sizes[category_id])
+        if missing:
+            raise ValueError(f"{where}: reference lists unknown unit(s) {', '.join(sorted(missing))}")
+
+    for key, units in data.get("units", {}).items():
+        where = f"{path}: units.{key}"
+        try:
+            category_id = get_category(key).id
+        except ValueError:
+            if key.lower() not in parsed.categories:
+                raise ValueError(f"{where}: unknown category") from None
+            category_id = key.lower()
+        _parse_units(category_id, units, where, parsed, sizes)
+
+    for key, units in data.get("aliases", {}).items():
+        category_id = key.lower()
+        builtin = CATEGORIES[category_id].factors if category_id in CATEGORIES else {}
+        for unit, terms in units.items():
+            where = f"{path}: aliases.{key}.{unit}"
+            if unit not in builtin and unit not in sizes.get(category_id, {}):
+                raise ValueError(f"{where}: unknown unit")
+            if isinstance(terms, str) or not all(isinstance(term, str) for term in terms):
+                raise ValueError(f"{where}: aliases must be a list of strings")
+            parsed.aliases.extend((category_id, unit, term) for term in terms)
+
+
+def _parse_units(category_id, units, where, parsed, sizes):
+    known = sizes.setdefault(category_id, dict(CATEGORIES[category_id].factors)
+                             if category_id in CATEGORIES else {})
+    kind = CATEGORIES[category_id].kind if category_id in CATEGORIES else parsed.categories[category_id]["kind"]
+    for unit, value in units.items():
+        if unit in known:
+            raise ValueError(f"{where}.{unit}: unit already defined")
+        if kind == AFFINE:
+            size = _affine_size(value, f"{where}.{unit}")
+        else:
+            size = _size(value, known, f"{where}.{unit}")
+        known[unit] = size
+        parsed.units.append((category_id, unit, size))
+
+
+def parse(paths):
+    """Read and validate plugin files into :class:`PluginUnits`."""
+    parsed = PluginUnits({}, [], [])
+    sizes = {}
+    for path in plugin_files(paths):
+        _parse(_read(path), path, parsed, sizes)
+    return parsed
+
+
+def snapshot_key(paths):
+    """Hash of the plugin files' contents, naming their compiled snapshot."""
+    digest = hashlib.sha256(f"unitconvert-plugins-{SNAPSHOT_VERSION}".encode())
+    for path in plugin_files(paths):
+        digest.update(path.name.encode() + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()[:24]
+
+
+def save_snapshot(parsed, path):
+    """Write parsed plugin units to an uncompressed ``.npz`` file."""
+    import numpy as np
+
+    category_ids = sorted({category_id for category_id, _, _ in parsed.units}
+                          | {category_id for category_id, _, _ in parsed.aliases})
+    index = {category_id: i for i, category_id in enumerate(category_ids)}
+    scales = [size[0] if isinstance(size, tuple) else size for _, _, size in parsed.units]
+    offsets = [size[1] if isinstance(size, tuple) else None for _, _, size in parsed.units]
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(f".{os.getpid()}.npz")
+    np.savez(
+        temporary,
+        metadata=np.array(json.dumps(parsed.categories)),
+        category_ids=np.array(category_ids, dtype=str),
+        unit_category=np.array([index[c] for c, _, _ in parsed.units], dtype=np.int16),
+        unit_name=np.array([unit for _, unit, _ in parsed.units], dtype=str),
+        numerator=np.array([str(scale.numerator) for scale in scales], dtype=str),
+        denominator=np.array([str(scale.denominator) for scale in scales], dtype=str),
+        affine=np.array([offset is not None for offset in offsets], dtype=bool),
+        offset_numerator=np.array([str((offset or 0).numerator) for offset in offsets], dtype=str),
+        offset_denominator=np.array([str((offset or Fraction(0)).denominator) for offset in offsets], dtype=str),
+        alias_category=np.array([index[c] for c, _, _ in parsed.aliases], dtype=np.int16),
+        alias_unit=np.array([unit for _, unit, _ in parsed.aliases], dtype=str),
+        alias_term=np.array([term for _, _, term in parsed.aliases], dtype=str),
+    )
+    os.replace(temporary, path)  # readers never see a partial file
+
+
+def load_snapshot(path):
+    """Read :class:`PluginUnits` back from a snapshot written by :func:`save_snapshot`."""
+    import numpy as np
+
+    with np.load(path) as data:
+        category_ids = data["category_ids"].tolist()
+        units = []
+        for category, unit, numerator, denominator, affine, offset_numerator, offset_denominator in zip(
+            data["unit_category"].tolist(), data["unit_name"].tolist(), data["numerator"].tolist(),
+            data["denominator"].tolist(), data["affine"].tolist(), data["offset_numerator"].tolist(),
+            data["offset_denominator"].tolist(),
+        ):
+            size = Fraction(int(numerator), int(denominator))
+            if affine:
+                size = (size, Fraction(int(offset_numerator), int(offset_denominator)))
+            units.append((category_ids[category], unit, size))
+        aliases = [(category_ids[category], unit, term) for category, unit, term in zip(
+            data["alias_category"].tolist(), data["alias_unit"].tolist(), data["alias_term"].tolist())]
+        return PluginUnits(json.loads(data["metadata"].item()), units, aliases)
+
+
+def load(paths, cache_dir=DEFAULT_CACHE_DIR):
+    """Parsed plugin units for ``paths``, from the snapshot when it is current.
+
+    ``cache_dir=None`` always parses and never writes a snapshot.
+    """
+    if cache_dir is None:
+        return parse(paths)
+    snapshot = Path(cache_dir) / f"plugins-{snapshot_key(paths)}.npz"
+    if snapshot.exists():
+        return load_snapshot(snapshot)
+    parsed = parse(paths)
+    try:
+        save_snapshot(parsed, snapshot)
+    except OSError:
+        pass  # read-only cache directory; parse again next time
+    return parsed
+
+
+def install(parsed):
+    """Register parsed plugin units and refresh every table derived from the registry."""
+    new = {}  # in definition order, which fixes the sidebar order of new categories
+    for category_id, unit, size in parsed.units:
+        new.setdefault(category_id, {})[unit] = size
+    aliases = {}
+    for category_id, unit, term in parsed.aliases:
+        aliases.setdefault(category_id, {}).setdefault(unit, []).append(term)
+
+    for category_id, units in new.items():
+        if category_id in CATEGORIES:
+            category = CATEGORIES[category_id]
+            clash = set(units) & set(category.factors)
+            if clash:
+                raise ValueError(f"{category.name} already defines {', '.join(sorted(clash))}")
+            factors = {**category.factors, **units}
+            category = category._replace(units=tuple(factors), factors=factors)
+        else:
+            fields = parsed.categories[category_id]
+            category = Category(
+                category_id, fields["name"], fields["kind"], tuple(units), units,
+                fields.get("symbol", ""), tuple(fields.get("reference", ())),
+                fields.get("icon", "🔄"), fields.get("group", "Plugins"), fields.get("dimension"),
+            )
+        register(category, aliases.pop(category_id, None))
+        _invalidate(category_id)
+    for category_id, units in aliases.items():
+        register(get_category(category_id), units)
+        _invalidate(category_id)
+
+
+def _invalidate(category_id):
+    from .search import default_index
+
+    engine.invalidate(category_id)
+    default_index.cache_clear()
+    for name in ("batch", "dimensions", "expression"):
+        module = sys.modules.get(f"{__package__}.{name}")
+        if module is None:
+            continue  # tables are built from the updated registry on import
+        if name == "batch":
+            module.invalidate(category_id)
+        else:
+            module.invalidate()
+
+
+def load_from_environment():
+    """Load and install ``UNICONVERT_PLUGINS`` if set; called on package import."""
+    paths = os.environ.get("UNICONVERT_PLUGINS")
+    if not paths:
+        return
+    cache_dir = os.environ.get("UNICONVERT_PLUGIN_CACHE", DEFAULT_CACHE_DIR)
+    install(load([path for path in paths.split(os.pathsep) if path], cache_dir or None))
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog="python -m unitconvert.plugins",
+                                     description="Validate plugin unit files and compile their snapshot.")
+    parser.add_argument("paths", nargs="+", help="plugin files or directories")
+    parser.add_argument("--cache-dir", default=os.environ.get("UNICONVERT_PLUGIN_CACHE", DEFAULT_CACHE_DIR),
+                        help="snapshot directory (default: %(default)s)")
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    try:
+        parsed = parse(args.paths)
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    parsed_in = time.perf_counter() - start
+    snapshot = Path(args.cache_dir) / f"plugins-{snapshot_key(args.paths)}.npz"
+    save_snapshot(parsed, snapshot)
+    start = time.perf_counter()
+    load_snapshot(snapshot)
+    loaded_in = time.perf_counter() - start
+    print(f"{len(parsed.units)} units, {len(parsed.categories)} new categories, {len(parsed.aliases)} aliases")
+    print(f"parsed in {parsed_in * 1000:.1f} ms, snapshot {snapshot} loads in {loaded_in * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Quick Reference tables derived from the same factors used for conversion."""
+from .engine import convert
+from .registry import AFFINE, get_category
+
+
+def _format(value):
+    # Whole numbers print in full, everything else to six significant digits
+    nearest = round(value)
+    if nearest and abs(value - nearest) <= 1e-9 * abs(value):
+        return f"{nearest:,}"
+    rounded = float(f"{value:.6g}")
+    if rounded.is_integer() and abs(rounded) < 1e15:
+        return f"{int(rounded):,}"
+    return f"{rounded:,g}"
+
+
+def _symbol(category, unit):
+    # Temperature has a symbol per unit, other categories one for the base unit
+    symbol = category.symbol
+    return symbol.get(unit, "") if isinstance(symbol, dict) else symbol
+
+
+def reference_table(category):
+    """Return the Quick Reference rows for a category as ``{column: values}``."""
+    category = get_category(category)
+    units = list(category.reference)
+    if category.id == "temperature":
+        return {
+            "Unit": units,
+            "Freezing Point": [
+                f"{_format(convert(category.id, 0, 'celsius', unit))}{_symbol(category, unit)}" for unit in units
+            ],
+            "Boiling Point": [
+                f"{_format(convert(category.id, 100, 'celsius', unit))}{_symbol(category, unit)}" for unit in units
+            ],
+        }
+    base = category.units[0]
+    symbol = _symbol(category, base) or base
+    if category.kind == AFFINE:  # plugin scale with an offset: show where 0 and 1 land
+        return {
+            "Unit": units,
+            "Zero": [f"{_format(convert(category.id, 0, unit, base))} {symbol}" for unit in units],
+            "One": [f"{_format(convert(category.id, 1, unit, base))} {symbol}" for unit in units],
+        }
+    return {
+        "Unit": units,
+        "Equivalent": [
+            f"{_format(convert(category.id, 1, unit, base))} {category.symbol}" for unit in units
+        ],
+    }
+
+
+def reference_markdown(category):
+    """Render the Quick Reference table as Markdown, so showing it needs no DataFrame."""
+    columns = reference_table(category)
+    rows = zip(*columns.values())
+    lines = [
+        "| " + " | ".join(columns) + " |",
+        "|" + "---|" * len(columns),
+        *("| " + " | ".join(row) + " |" for row in rows),
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,332 @@
+"""Unit definitions for every category the converter knows about.
+
+Linear categories store each unit's exact size in base units (the first unit
+listed), using definitional constants such as 1 inch = 0.0254 m, so every
+factor is a :class:`~fractions.Fraction`.  Temperature is affine and stores
+each unit as a ``(scale, offset)`` pair such that
+``kelvin = value * scale + offset``.
+
+``symbol`` is the base unit's symbol (a per-unit mapping for temperature) and
+``reference`` lists the units shown in the app's Quick Reference table.
+``icon`` and ``group`` place the category's button in the app's sidebar tabs.
+``dimension`` (``{base: exponent}``) is only set for categories loaded from
+plugin files; the built-in ones are mapped in :mod:`unitconvert.dimensions`.
+"""
+from fractions import Fraction
+from typing import NamedTuple
+
+LINEAR = "linear"
+AFFINE = "affine"
+
+# Definitional constants shared by several categories
+_INCH = Fraction('0.0254')
+_FOOT = 12 * _INCH
+_POUND = Fraction('0.45359237')
+_GALLON = 231 * (_INCH / Fraction('0.1'))**3
+_STANDARD_GRAVITY = Fraction('9.80665')
+_CALORIE = Fraction('4.184')
+_BTU = Fraction('1055.05585262')
+
+
+class Category(NamedTuple):
+    id: str
+    name: str
+    kind: str
+    units: tuple
+    factors: dict
+    symbol: str = ""
+    reference: tuple = ()
+    icon: str = "🔄"
+    group: str = ""
+    dimension: object = None
+
+
+def _linear(id, name, icon, group, sizes, symbol, reference):
+    factors = {unit: Fraction(size) for unit, size in sizes.items()}
+    return Category(id, name, LINEAR, tuple(factors), factors, symbol, reference, icon, group)
+
+
+def _affine(id, name, icon, group, factors, symbols, reference):
+    return Category(id, name, AFFINE, tuple(factors), factors, symbols, reference, icon, group)
+
+
+_DEFINITIONS = (
+    _linear("length", "Length", "📏", "Basic", {
+        'meter': 1,
+        'kilometer': 1000,
+        'centimeter': '0.01',
+        'millimeter': '0.001',
+        'inch': _INCH,
+        'foot': _FOOT,
+        'yard': 3 * _FOOT,
+        'mile': 5280 * _FOOT,
+        'nautical mile': 1852
+    }, 'm', ('meter', 'kilometer', 'inch', 'foot', 'mile')),
+    _linear("weight", "Weight", "⚖️", "Basic", {
+        'kilogram': 1,
+        'gram': '0.001',
+        'milligram': '0.000001',
+        'pound': _POUND,
+        'ounce': _POUND / 16,
+        'ton': 1000,
+        'stone': 14 * _POUND
+    }, 'kg', ('kilogram', 'gram', 'pound', 'ounce', 'ton')),
+    _affine("temperature", "Temperature", "🌡️", "Basic", {
+        'celsius': (Fraction(1), Fraction('273.15')),
+        'fahrenheit': (Fraction(5, 9), Fraction('273.15') - Fraction(160, 9)),
+        'kelvin': (Fraction(1), Fraction(0))
+    }, {'celsius': '°C', 'fahrenheit': '°F', 'kelvin': 'K'}, ('celsius', 'fahrenheit', 'kelvin')),
+    _linear("volume", "Volume", "🧪", "Basic", {
+        'liter': 1,
+        'milliliter': '0.001',
+        'cubic meter': 1000,
+        'gallon (US)': _GALLON,
+        'quart (US)': _GALLON / 4,
+        'pint (US)': _GALLON / 8,
+        'cup (US)': _GALLON / 16,
+        'fluid ounce (US)': _GALLON / 128,
+        'tablespoon (US)': _GALLON / 256,
+        'teaspoon (US)': _GALLON / 768
+    }, 'L', ('liter', 'milliliter', 'gallon (US)', 'cup (US)', 'fluid ounce (US)')),
+    _linear("time", "Time", "⏱️", "Science", {
+        'second': 1,
+        'millisecond': '0.001',
+        'minute': 60,
+        'hour': 3600,
+        'day': 86400,
+        'week': 604800,
+        'month (30 days)': 2592000,
+        'year (365 days)': 31536000,
+        'decade': 315360000,
+        'century': 3153600000,
+        'millennium': 31536000000
+    }, 's', ('second', 'minute', 'hour', 'day', 'year (365 days)')),
+    _linear("data", "Data", "💾", "Digital", {
+        'byte': 1,
+        'kilobyte': 1000,
+        'megabyte': 1000**2,
+        'gigabyte': 1000**3,
+        'terabyte': 1000**4,
+        'petabyte': 1000**5,
+        'bit': Fraction(1, 8),
+        'kibibyte': 1024,
+        'mebibyte': 1024**2,
+        'gibibyte': 1024**3,
+        'tebibyte': 1024**4,
+        'pebibyte': 1024**5
+    }, 'B', ('byte', 'kilobyte', 'megabyte', 'gigabyte', 'terabyte')),
+    _linear("area", "Area", "📐", "Basic", {
+        'square meter': 1,
+        'square kilometer': 1000000,
+        'square centimeter': '0.0001',
+        'square millimeter': '0.000001',
+        'square inch': _INCH**2,
+        'square foot': _FOOT**2,
+        'square yard': (3 * _FOOT)**2,
+        'acre': 43560 * _FOOT**2,
+        'hectare': 10000
+    }, 'm²', ('square meter', 'square kilometer', 'acre', 'hectare')),
+    _linear("speed", "Speed", "⚡", "Basic", {
+        'meter per second': 1,
+        'kilometer per hour': Fraction(1000, 3600),
+        'mile per hour': 5280 * _FOOT / 3600,
+        'knot': Fraction(1852, 3600),
+        'foot per second': _FOOT,
+        'inch per second': _INCH
+    }, 'm/s', ('meter per second', 'kilometer per hour', 'mile per hour', 'knot')),
+    _linear("energy", "Energy", "⚗️", "Science", {
+        'joule': 1,
+        'kilojoule': 1000,
+        'calorie': _CALORIE,
+        'kilocalorie': 1000 * _CALORIE,
+        'watt hour': 3600,
+        'kilowatt hour': 3600000,
+        'electron volt': '1.602176634e-19',
+        'british thermal unit': _BTU
+    }, 'J', ('joule', 'kilojoule', 'kilocalorie', 'watt hour', 'kilowatt hour')),
+    _linear("pressure", "Pressure", "📊", "Science", {
+        'pascal': 1,
+        'kilopascal': 1000,
+        'megapascal': 1000000,
+        'bar': 100000,
+        'atmosphere': 101325,
+        'torr': Fraction(101325, 760),
+        'psi': _POUND * _STANDARD_GRAVITY / _INCH**2,
+        'millimeter of mercury': '133.322387415'
+    }, 'Pa', ('pascal', 'kilopascal', 'bar', 'atmosphere', 'psi')),
+    _linear("power", "Power", "🔋", "Science", {
+        'watt': 1,
+        'kilowatt': 1000,
+        'megawatt': 1000000,
+        'horsepower': 550 * _FOOT * _POUND * _STANDARD_GRAVITY,
+        'british thermal unit per hour': _BTU / 3600,
+        'calorie per second': _CALORIE
+    }, 'W', ('watt', 'kilowatt', 'horsepower', 'british thermal unit per hour')),
+    _linear("frequency", "Frequency", "📶", "Digital", {
+        'hertz': 1,
+        'kilohertz': 1000,
+        'megahertz': 1000000,
+        'gigahertz': 1000000000,
+        'cycle per second': 1,
+        'revolution per minute': Fraction(1, 60),
+        'beat per minute': Fraction(1, 60)
+    }, 'Hz', ('hertz', 'kilohertz', 'megahertz', 'gigahertz')),
+)
+
+CATEGORIES = {category.id: category for category in _DEFINITIONS}
+
+# Abbreviations and alternative spellings accepted by unit search, in
+# addition to each unit's own name and its plural.  Symbols are written in
+# their SI case, which search honours when the query is cased (mW vs MW)
+ALIASES = {
+    "length": {
+        'meter': ('m', 'metre', 'metres'),
+        'kilometer': ('km', 'kilometre', 'kilometres'),
+        'centimeter': ('cm', 'centimetre', 'centimetres'),
+        'millimeter': ('mm', 'millimetre', 'millimetres'),
+        'inch': ('in', 'inches', '"'),
+        'foot': ('ft', 'feet', "'"),
+        'yard': ('yd',),
+        'mile': ('mi',),
+        'nautical mile': ('nmi', 'NM'),
+    },
+    "weight": {
+        'kilogram': ('kg', 'kilo', 'kilos'),
+        'gram': ('g',),
+        'milligram': ('mg',),
+        'pound': ('lb', 'lbs'),
+        'ounce': ('oz',),
+        'ton': ('t', 'tonne', 'tonnes', 'metric ton'),
+        'stone': ('st',),
+    },
+    "temperature": {
+        'celsius': ('C', '°C', 'degC'),
+        'fahrenheit': ('F', '°F', 'degF'),
+        'kelvin': ('K',),
+    },
+    "volume": {
+        'liter': ('L', 'litre', 'litres'),
+        'milliliter': ('mL', 'millilitre', 'millilitres'),
+        'cubic meter': ('m3', 'm³', 'cubic metre'),
+        'gallon (US)': ('gal', 'gallon', 'gallons'),
+        'quart (US)': ('qt', 'quart', 'quarts'),
+        'pint (US)': ('pt', 'pint', 'pints'),
+        'cup (US)': ('cup', 'cups'),
+        'fluid ounce (US)': ('fl oz', 'floz', 'fluid ounce', 'fluid ounces'),
+        'tablespoon (US)': ('tbsp', 'tablespoon', 'tablespoons'),
+        'teaspoon (US)': ('tsp', 'teaspoon', 'teaspoons'),
+    },
+    "time": {
+        'second': ('s', 'sec', 'secs'),
+        'millisecond': ('ms',),
+        'minute': ('min', 'mins'),
+        'hour': ('h', 'hr', 'hrs'),
+        'day': ('d',),
+        'week': ('wk',),
+        'month (30 days)': ('month', 'months'),
+        'year (365 days)': ('yr', 'year', 'years'),
+        'century': ('centuries',),
+        'millennium': ('millennia',),
+    },
+    "data": {
+        'byte': ('B',),
+        'kilobyte': ('kB',),
+        'megabyte': ('MB',),
+        'gigabyte': ('GB',),
+        'terabyte': ('TB',),
+        'petabyte': ('PB',),
+        'kibibyte': ('KiB',),
+        'mebibyte': ('MiB',),
+        'gibibyte': ('GiB',),
+        'tebibyte': ('TiB',),
+        'pebibyte': ('PiB',),
+    },
+    "area": {
+        'square meter': ('m2', 'm²', 'sq m', 'square metre'),
+        'square kilometer': ('km2', 'km²', 'sq km', 'square kilometre'),
+        'square centimeter': ('cm2', 'cm²', 'sq cm'),
+        'square millimeter': ('mm2', 'mm²', 'sq mm'),
+        'square inch': ('in2', 'in²', 'sq in', 'square inches'),
+        'square foot': ('ft2', 'ft²', 'sq ft', 'square feet'),
+        'square yard': ('yd2', 'yd²', 'sq yd'),
+        'acre': ('ac',),
+        'hectare': ('ha',),
+    },
+    "speed": {
+        'meter per second': ('m/s', 'mps', 'meters per second'),
+        'kilometer per hour': ('km/h', 'kph', 'kmh', 'kilometers per hour'),
+        'mile per hour': ('mph', 'mi/h', 'miles per hour'),
+        'knot': ('kn', 'kt', 'knots'),
+        'foot per second': ('ft/s', 'fps', 'feet per second'),
+        'inch per second': ('in/s', 'ips', 'inches per second'),
+    },
+    "energy": {
+        'joule': ('J',),
+        'kilojoule': ('kJ',),
+        'calorie': ('cal',),
+        'kilocalorie': ('kcal',),
+        'watt hour': ('Wh',),
+        'kilowatt hour': ('kWh',),
+        'electron volt': ('eV',),
+        'british thermal unit': ('BTU',),
+    },
+    "pressure": {
+        'pascal': ('Pa',),
+        'kilopascal': ('kPa',),
+        'megapascal': ('MPa',),
+        'bar': (),
+        'atmosphere': ('atm',),
+        'torr': (),
+        'psi': ('lbf/in2',),
+        'millimeter of mercury': ('mmHg',),
+    },
+    "power": {
+        'watt': ('W',),
+        'kilowatt': ('kW',),
+        'megawatt': ('MW',),
+        'horsepower': ('hp',),
+        'british thermal unit per hour': ('BTU/h', 'BTU/hr'),
+        'calorie per second': ('cal/s',),
+    },
+    "frequency": {
+        'hertz': ('Hz',),
+        'kilohertz': ('kHz',),
+        'megahertz': ('MHz',),
+        'gigahertz': ('GHz',),
+        'cycle per second': ('cps',),
+        'revolution per minute': ('rpm',),
+        'beat per minute': ('bpm',),
+    },
+}
+
+
+def _groups(categories):
+    groups = {}
+    for category in categories:
+        groups.setdefault(category.group, []).append(category)
+    return groups
+
+
+GROUPS = _groups(_DEFINITIONS)
+
+
+def register(category, aliases=None):
+    """Add a category, or replace one with an extended copy, and its aliases.
+
+    Tables derived from the registry must be invalidated by the caller; see
+    :func:`unitconvert.plugins.install`.
+    """
+    CATEGORIES[category.id] = category
+    for unit, terms in (aliases or {}).items():
+        known = ALIASES.setdefault(category.id, {}).get(unit, ())
+        ALIASES[category.id][unit] = known + tuple(term for term in terms if term not in known)
+    GROUPS.clear()
+    GROUPS.update(_groups(CATEGORIES.values()))
+
+
+def get_category(category):
+    """Look up a category by id or display name ("length" or "Length")."""
+    try:
+        return CATEGORIES[category.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f"Unknown category: {category!r}") from None
@@ -0,0 +1,219 @@
+"""Fuzzy unit search across every category.
+
+:class:`UnitIndex` is built once from the registry: every unit name, its
+plural and its aliases become search terms, held in an exact-match dict, a
+sorted list for prefix lookups and a trigram index for typo-tolerant
+matches.  :meth:`UnitIndex.resolve` turns queries such as ``"5 ft to m"`` or
+``"kwh"`` into a category and units.
+
+Unit names match in any case.  Symbols keep their case where it changes the
+meaning: ``mW`` never matches megawatt (``MW``) and ``Mg`` never matches
+milligram (``mg``), while an all-lowercase query such as ``"kwh"`` still
+matches ``kWh``.
+"""
+import math
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from typing import NamedTuple
+
+from .registry import ALIASES, CATEGORIES
+
+# Minimum trigram similarity for a fuzzy match
+MIN_SIMILARITY = 0.3
+
+# Letters whose case tells SI prefixes (milli/mega, pico/peta) or bits and bytes apart
+_CASED = set("mMpPbB")
+
+_QUERY = re.compile(
+    r"^\s*(?P<value>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:e[-+]?\d+)?)?\s*(?P<from>.+?)"
+    r"(?:\s+(?:to|in|into|as|->|→)\s+(?P<to>.+?))?\s*$",
+    re.IGNORECASE,
+)
+
+
+class Match(NamedTuple):
+    category: str
+    unit: str
+    term: str
+    score: float
+
+
+class Resolution(NamedTuple):
+    value: object  # float, or None when the query has no number
+    category: str
+    from_unit: str
+    to_unit: object  # unit name, or None when the query names one unit
+    score: float
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def _is_symbol(alias):
+    return len(alias) <= 3 or alias != alias.lower() or not alias.replace(" ", "").isalpha()
+
+
+def _compatible(query, symbol):
+    """Whether ``query`` may match ``symbol`` ignoring case."""
+    if query == query.lower():
+        return True  # typed without case, e.g. "kwh"
+    return all(q == s or q not in _CASED for q, s in zip(query, symbol))
+
+
+def _plural(name):
+    for joiner in (" per ", " of "):
+        if joiner in name:
+            head, tail = name.split(joiner, 1)
+            return _plural(head) + joiner + tail
+    return name + ("es" if name.endswith(("s", "x", "ch", "sh")) else "s")
+
+
+def _terms(unit, aliases):
+    """``(term, symbol)`` pairs; ``symbol`` is the cased spelling, or None for names."""
+    base = re.sub(r"\s*\(.*?\)", "", unit)
+    yield unit, None
+    yield base, None
+    yield _plural(base), None
+    for alias in aliases:
+        yield alias, alias if _is_symbol(alias) else None
+
+
+def _trigrams(term):
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class UnitIndex:
+    """Prebuilt exact, prefix and trigram index over unit names and aliases."""
+
+    def __init__(self, categories=None, aliases=None):
+        categories = CATEGORIES if categories is None else categories
+        aliases = ALIASES if aliases is None else aliases
+        exact = {}
+        for category in categories.values():
+            category_aliases = aliases.get(category.id, {})
+            for unit in category.units:
+                for term, symbol in _terms(unit, category_aliases.get(unit, ())):
+                    targets = exact.setdefault(normalize(term), [])
+                    if (category.id, unit, symbol) not in targets:
+                        targets.append((category.id, unit, symbol))
+        self._exact = exact
+        self._terms = sorted(exact)
+        self._grams = []
+        self._postings = {}
+        for i, term in enumerate(self._terms):
+            grams = frozenset(_trigrams(term))
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    def __len__(self):
+        return len(self._terms)
+
+    def items(self):
+        """``(term, [(category, unit, symbol), ...])`` for every indexed term.
+
+        ``symbol`` is the alias as registered when its case matters, else None.
+        """
+        return ((term, list(self._exact[term])) for term in self._terms)
+
+    def _matches(self, term, query):
+        """``(category, unit, case exact)`` for the targets of ``term`` that ``query`` may mean."""
+        for category, unit, symbol in self._exact[term]:
+            if symbol is None or symbol == query:
+                yield category, unit, True
+            elif _compatible(query, symbol):
+                yield category, unit, False
+
+    def lookup(self, term):
+        """Exact matches for a term as ``[(category, unit), ...]``.
+
+        Matches with the query's exact case come first.
+        """
+        query = " ".join(term.split())
+        folded = normalize(term)
+        if folded not in self._exact:
+            return []
+        matches = sorted(self._matches(folded, query), key=lambda match: not match[2])
+        return list(dict.fromkeys((category, unit) for category, unit, _ in matches))
+
+    def search(self, query, limit=5):
+        """Best matching units for ``query``, best first, one entry per unit."""
+        cased = " ".join(query.split())
+        query = cased.lower()
+        if not query:
+            return []
+        best = {}
+
+        def offer(term, score):
+            for category, unit, case_exact in self._matches(term, cased):
+                score_here = score if case_exact else 0.95 * score
+                if score_here > best.get((category, unit), (0.0,))[0]:
+                    best[category, unit] = (score_here, term)
+
+        exact = query in self._exact
+        if exact:
+            offer(query, 1.0)
+            exact = bool(best)
+        start = bisect_left(self._terms, query)
+        for term in self._terms[start:start + 50]:
+            if not term.startswith(query):
+                break
+            offer(term, 0.5 + 0.4 * len(query) / len(term))
+        if exact:
+            return self._ranked(best, limit)
+        # A term reaching MIN_SIMILARITY shares at least `need` of the query's
+        # grams, so it appears in the postings of any len(grams) - need + 1 of
+        # them: only the rarest are scanned, never the near-universal ones
+        grams = _trigrams(query)
+        need = max(1, math.ceil(MIN_SIMILARITY * len(grams) - 1e-9))
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set().union(*postings[:len(grams) - need + 1])
+        for i in candidates:
+            term_grams = self._grams[i]
+            if len(term_grams) * MIN_SIMILARITY > len(grams):
+                continue  # too long to reach the threshold
+            shared = len(grams & term_grams)
+            similarity = shared / (len(grams) + len(term_grams) - shared)
+            if similarity >= MIN_SIMILARITY:
+                offer(self._terms[i], 0.8 * similarity)
+        return self._ranked(best, limit)
+
+    @staticmethod
+    def _ranked(best, limit):
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[1][1]))
+        return [Match(category, unit, term, score)
+                for (category, unit), (score, term) in ranked[:limit]]
+
+    def resolve(self, text):
+        """Parse ``"[value] unit [to unit]"`` into a :class:`Resolution`, or None."""
+        parsed = _QUERY.match(text)
+        if parsed is None:
+            return None
+        value = parsed["value"]
+        value = float(value) if value is not None else None
+        sources = self.search(parsed["from"], limit=10)
+        if parsed["to"] is None:
+            if not sources:
+                return None
+            match = sources[0]
+            return Resolution(value, match.category, match.unit, None, match.score)
+
+        targets = self.search(parsed["to"], limit=10)
+        pairs = [
+            (source.score + target.score, source, target)
+            for source in sources for target in targets
+            if source.category == target.category
+        ]
+        if not pairs:
+            return None
+        score, source, target = max(pairs, key=lambda pair: pair[0])
+        return Resolution(value, source.category, source.unit, target.unit, score / 2)
+
+
+@lru_cache(maxsize=None)
+def default_index():
+    """The process-wide :class:`UnitIndex` over the built-in registry."""
+    return UnitIndex()
@@ -0,0 +1,152 @@
+"""HTTP/JSON conversion service.
+
+A plain ASGI application exposing the conversion engine without a Streamlit
+session per request.  Serve it with any ASGI server, for example::
+
+    uvicorn unitconvert.service:app --workers 4
+
+Endpoints (all JSON):
+
+``POST /convert``
+    ``{"category": "length", "value": 5, "from": "foot", "to": "meter"}``
+    returns ``{"result": 1.524}``.
+``POST /convert/batch``
+    ``{"category": ..., "from": ..., "to": ..., "values": [...]}`` returns
+    ``{"results": [...]}``, converted in one vectorized pass.
+``GET /health``
+    returns ``{"status": "ok"}``.
+
+Values must be JSON numbers and results finite; anything else is a 400.
+Request bodies of ``OFFLOAD_BYTES`` or more are handled on a worker thread so
+a large batch does not stall the event loop.
+"""
+import asyncio
+import json
+import math
+
+import numpy as np
+
+from .batch import convert_array
+from .coldstart import warmup
+from .engine import convert
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+OFFLOAD_BYTES = 256 * 1024
+
+_NUMBER_TYPES = {int, float}  # not bool, which json also decodes to an int subclass
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_request(body):
+    try:
+        payload = json.loads(body)
+        fields = payload["category"], payload["from"], payload["to"]
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPError(400, "Request body must be valid JSON") from None
+    except (KeyError, TypeError):
+        raise HTTPError(400, "Request must include 'category', 'from' and 'to'") from None
+    if not all(isinstance(field, str) for field in fields):
+        raise HTTPError(400, "'category', 'from' and 'to' must be strings")
+    return (*fields, payload)
+
+
+def handle_convert(body):
+    category, from_unit, to_unit, payload = _parse_request(body)
+    value = payload.get("value")
+    if type(value) not in _NUMBER_TYPES or not math.isfinite(value):
+        raise HTTPError(400, "'value' must be a finite number")
+    result = convert(category, value, from_unit, to_unit)
+    if not math.isfinite(result):
+        raise HTTPError(400, "Result is out of range")
+    return {"result": result}
+
+
+def handle_batch(body):
+    category, from_unit, to_unit, payload = _parse_request(body)
+    values = payload.get("values")
+    if not isinstance(values, list) or not all(type(value) in _NUMBER_TYPES for value in values):
+        raise HTTPError(400, "'values' must be a list of numbers")
+    array = np.asarray(values, dtype=np.float64)
+    if not np.isfinite(array).all():
+        raise HTTPError(400, "'values' must be finite numbers")
+    with np.errstate(over="ignore"):  # checked below
+        results = convert_array(category, array, from_unit, to_unit, out=array)
+    if not np.isfinite(results).all():
+        raise HTTPError(400, "A result is out of range")
+    return {"results": results.tolist()}
+
+
+ROUTES = {
+    ("POST", "/convert"): handle_convert,
+    ("POST", "/convert/batch"): handle_batch,
+    ("GET", "/health"): lambda body: {"status": "ok"},
+}
+
+
+async def _read_body(receive):
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _encode(payload):
+    return json.dumps(payload, allow_nan=False).encode()
+
+
+async def _respond(send, status, body):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                warmup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"].rstrip("/") or "/"
+    handler = ROUTES.get((scope["method"], path))
+    try:
+        if handler is None:
+            if any(route_path == path for _, route_path in ROUTES):
+                raise HTTPError(405, "Method not allowed")
+            raise HTTPError(404, "Not found")
+        body = await _read_body(receive)
+        if len(body) >= OFFLOAD_BYTES:
+            payload = await asyncio.get_running_loop().run_in_executor(None, handler, body)
+        else:
+            payload = handler(body)
+        response = _encode(payload)
+    except HTTPError as exc:
+        await _respond(send, exc.status, _encode({"error": str(exc)}))
+    except ValueError as exc:
+        await _respond(send, 400, _encode({"error": str(exc)}))
+    else:
+        await _respond(send, 200, response)
@@ -0,0 +1,265 @@
+"""Live conversion of continuous sensor feeds.
+
+A source is an async iterator of readings: a simulated signal, or
+newline-separated numbers from a TCP socket, a Unix socket or a named pipe
+(see :func:`open_source`).  :class:`LiveConversion` reads the source into a
+bounded queue (a full queue stops reading, which pushes back on sockets and
+pipes), converts whatever has arrived as one NumPy micro-batch, and keeps
+the most recent readings in a rolling window.  :class:`LiveFeed` runs a
+conversion on its own event loop thread for synchronous callers such as the
+Streamlit page.
+
+Try it from a shell::
+
+    python -m unitconvert.stream temperature celsius fahrenheit --source simulated:20
+    mkfifo /tmp/probe && python -m unitconvert.stream pressure bar psi --source pipe:/tmp/probe
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from .engine import conversion_factor
+
+DEFAULT_QUEUE_SIZE = 4096
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_WINDOW = 2000
+
+
+async def simulated_source(rate=20.0, base=20.0, amplitude=5.0, period=10.0, noise=0.2, seed=None):
+    """A noisy sine wave sampled ``rate`` times per second, for testing without hardware."""
+    rng = random.Random(seed)
+    start = time.monotonic()
+    i = 0
+    while True:
+        elapsed = i / rate
+        yield base + amplitude * math.sin(2 * math.pi * elapsed / period) + rng.gauss(0, noise)
+        i += 1
+        await asyncio.sleep(max(0.0, start + i / rate - time.monotonic()))
+
+
+async def _lines(reader):
+    while line := await reader.readline():
+        try:
+            yield float(line)
+        except ValueError:
+            continue  # partial or malformed reading
+
+
+async def socket_source(host, port):
+    """Readings from a TCP server that writes one number per line."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        async for reading in _lines(reader):
+            yield reading
+    finally:
+        writer.close()
+
+
+async def unix_source(path):
+    """Readings from a Unix domain socket that writes one number per line."""
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        async for reading in _lines(reader):
+            yield reading
+    finally:
+        writer.close()
+
+
+async def pipe_source(path):
+    """Readings written one per line into a named pipe (FIFO).
+
+    The pipe is opened for reading and writing so that opening never blocks
+    and the feed survives writers coming and going; it ends only when
+    cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    pipe = os.fdopen(os.open(path, os.O_RDWR | os.O_NONBLOCK), "rb", 0)
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    try:
+        async for reading in _lines(reader):
+            yield reading
+    finally:
+        transport.close()
+
+
+def open_source(spec):
+    """Source from a spec: ``simulated[:rate]``, ``tcp://host:port``, ``unix:///path`` or ``pipe:/path``."""
+    scheme, _, rest = spec.partition(":")
+    if scheme == "simulated":
+        return simulated_source(float(rest) if rest else 20.0)
+    if scheme == "tcp":
+        host, _, port = rest.removeprefix("//").rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError(f"Expected tcp://host:port, got {spec!r}")
+        return socket_source(host, int(port))
+    if scheme == "unix":
+        return unix_source(rest.removeprefix("//"))
+    if scheme == "pipe":
+        return pipe_source(rest)
+    raise ValueError(f"Unknown source {spec!r}; use simulated, tcp://, unix:// or pipe:")
+
+
+class LiveConversion:
+    """Convert readings from an async source in micro-batches into a rolling window."""
+
+    def __init__(self, category, from_unit, to_unit, window=DEFAULT_WINDOW,
+                 queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE):
+        conversion_factor(category, from_unit, to_unit)  # fail fast on unknown units
+        self.category = category
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.received = 0
+        self.batches = 0
+        self.peak_queue = 0
+        self._times = deque(maxlen=window)
+        self._readings = deque(maxlen=window)
+        self._converted = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    async def _produce(self, source, queue):
+        cancelled = False
+        try:
+            async for reading in source:
+                await queue.put((time.time(), reading))  # waits while the queue is full
+        except asyncio.CancelledError:
+            cancelled = True  # the consumer is gone; nothing would take the end marker
+            raise
+        finally:
+            if not cancelled:
+                await queue.put(None)
+
+    def _convert(self, batch):
+        from .batch import convert_array
+
+        times, readings = zip(*batch)
+        converted = convert_array(self.category, readings, self.from_unit, self.to_unit)
+        with self._lock:
+            self._times.extend(times)
+            self._readings.extend(readings)
+            self._converted.extend(converted.tolist())
+            self.received += len(batch)
+            self.batches += 1
+
+    async def run(self, source):
+        """Consume ``source`` until it ends or the task is cancelled."""
+        queue = asyncio.Queue(self.queue_size)
+        producer = asyncio.create_task(self._produce(source, queue))
+        try:
+            while True:
+                batch = [await queue.get()]
+                self.peak_queue = max(self.peak_queue, queue.qsize() + 1)
+                while len(batch) < self.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                finished = batch[-1] is None
+                batch = [item for item in batch if item is not None]
+                if batch:
+                    self._convert(batch)
+                if finished:
+                    break
+                await asyncio.sleep(0)  # let the producer refill between batches
+        finally:
+            producer.cancel()
+            error, = await asyncio.gather(producer, return_exceptions=True)
+        if isinstance(error, Exception):
+            raise error  # the source failed, e.g. connection refused
+
+    def snapshot(self):
+        """``(timestamps, readings, converted)`` lists for the current window."""
+        with self._lock:
+            return list(self._times), list(self._readings), list(self._converted)
+
+    def latest(self):
+        """``(timestamp, reading, converted)`` of the newest reading, or None."""
+        with self._lock:
+            if not self._times:
+                return None
+            return self._times[-1], self._readings[-1], self._converted[-1]
+
+
+class LiveFeed:
+    """Run a :class:`LiveConversion` on a background event loop thread."""
+
+    def __init__(self, conversion, spec):
+        self.conversion = conversion
+        self.spec = spec
+        self.error = None
+        self._loop = None
+        self._task = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=asyncio.run, args=(self._main(),),
+                                        name=f"unitconvert-feed-{spec}", daemon=True)
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._ready.set()
+        try:
+            await self.conversion.run(open_source(self.spec))
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:  # surfaced to the caller through .error
+            self.error = exc
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def stop(self, timeout=2.0):
+        if self.running:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:  # the feed ended and closed its loop after the check
+                pass
+            self._thread.join(timeout)
+
+
+async def _print_feed(conversion, spec, duration):
+    task = asyncio.create_task(conversion.run(open_source(spec)))
+    deadline = time.monotonic() + duration if duration else None
+    seen = 0
+    while not task.done() and (deadline is None or time.monotonic() < deadline):
+        await asyncio.sleep(0.5)
+        latest = conversion.latest()
+        if latest and conversion.received != seen:
+            seen = conversion.received
+            print(f"{seen:>10,} readings  {latest[1]:>14.6g} {conversion.from_unit} = "
+                  f"{latest[2]:.6g} {conversion.to_unit}")
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m unitconvert.stream",
+                                     description="Convert a live feed of readings.")
+    parser.add_argument("category")
+    parser.add_argument("from_unit")
+    parser.add_argument("to_unit")
+    parser.add_argument("--source", default="simulated",
+                        help="simulated[:rate], tcp://host:port, unix:///path or pipe:/path")
+    parser.add_argument("--duration", type=float, default=0, help="seconds to run (default: until the feed ends)")
+    args = parser.parse_args(argv)
+    try:
+        conversion = LiveConversion(args.category, args.from_unit, args.to_unit)
+    except ValueError as exc:
+        parser.error(str(exc))
+    try:
+        asyncio.run(_print_feed(conversion, args.source, args.duration))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()